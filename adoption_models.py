@@ -0,0 +1,249 @@
+import copy
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Curves map years to percent adoption. Parameters are passed as one row per
+# agent, so a single call evaluates or fits a whole population.
+STEEPNESS = 10  # Default logistic steepness over the span to the integration year
+INTEGRATED_PROGRESS = 99.0  # Adoption credited at an agent's integration year
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9
+PARALLEL_THRESHOLD = 50_000
+CHUNK_SIZE = 10_000
+_MAX_EXPONENT = 700.0  # Keeps np.exp finite
+_MAX_LOG_PARAM = 30.0  # Bounds log-space parameters so rates stay finite
+_MAX_STEP = 1.0  # Per-iteration step limit; keeps log-space rates from collapsing to zero
+
+
+class AdoptionModel(ABC):
+    name = None
+    label = None
+    param_names = ()
+    positive = ()  # Parameters fitted in log space so they stay positive
+
+    @abstractmethod
+    def evaluate(self, params, years, start):
+        pass
+
+    @abstractmethod
+    def default_params(self, end_years, start, steepness):
+        pass
+
+    def to_free(self, params):
+        params = np.array(params, dtype=float)
+        for i in self.positive:
+            params[:, i] = np.log(np.maximum(params[:, i], 1e-12))
+        return params
+
+    def from_free(self, free):
+        params = np.array(free, dtype=float)
+        for i in self.positive:
+            params[:, i] = np.exp(np.clip(params[:, i], -_MAX_LOG_PARAM, _MAX_LOG_PARAM))
+        return params
+
+
+class LogisticModel(AdoptionModel):
+    # 100 / (1 + exp(-rate * (t - midpoint)))
+    name = 'logistic'
+    label = 'Logistic'
+    param_names = ('rate', 'midpoint')
+    positive = (0,)
+
+    def evaluate(self, params, years, start):
+        rate, midpoint = params[:, 0:1], params[:, 1:2]
+        exponent = np.clip(-rate * (years - midpoint), -_MAX_EXPONENT, _MAX_EXPONENT)
+        return 100 / (1 + np.exp(exponent))
+
+    def default_params(self, end_years, start, steepness):
+        span = end_years - start
+        return np.column_stack([steepness / span, start + span / 2])
+
+
+class GompertzModel(AdoptionModel):
+    # 100 * exp(-ln 2 * exp(-rate * (t - midpoint))): slow start, long tail,
+    # crossing 50% at the midpoint
+    name = 'gompertz'
+    label = 'Gompertz'
+    param_names = ('rate', 'midpoint')
+    positive = (0,)
+
+    def evaluate(self, params, years, start):
+        rate, midpoint = params[:, 0:1], params[:, 1:2]
+        exponent = np.clip(-rate * (years - midpoint), -_MAX_EXPONENT, np.log(_MAX_EXPONENT))
+        return 100 * np.exp(-np.log(2) * np.exp(exponent))
+
+    def default_params(self, end_years, start, steepness):
+        # Same midpoint and midpoint slope as the default logistic
+        span = end_years - start
+        return np.column_stack([steepness / span / (2 * np.log(2)), start + span / 2])
+
+
+class BassModel(AdoptionModel):
+    # Bass diffusion from the start year with innovation p and imitation q:
+    # 100 * (1 - exp(-(p + q) t)) / (1 + (q / p) exp(-(p + q) t))
+    name = 'bass'
+    label = 'Bass diffusion'
+    param_names = ('innovation', 'imitation')
+    positive = (0, 1)
+    IMITATION_RATIO = 0.38 / 0.03  # Typical q/p from published diffusion studies
+
+    def evaluate(self, params, years, start):
+        p, q = params[:, 0:1], params[:, 1:2]
+        elapsed = np.maximum(years - start, 0)
+        decay = np.exp(-np.minimum((p + q) * elapsed, _MAX_EXPONENT))
+        return 100 * (1 - decay) / (1 + q / p * decay)
+
+    def default_params(self, end_years, start, steepness):
+        # Crosses 50% halfway to the integration year
+        span = end_years - start
+        total = 2 * np.log(2 + self.IMITATION_RATIO) / span
+        p = total / (1 + self.IMITATION_RATIO)
+        return np.column_stack([p, total - p])
+
+
+MODELS = {model.name: model for model in (LogisticModel(), GompertzModel(), BassModel())}
+DEFAULT_MODEL = 'logistic'
+
+
+def get_model(name):
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown adoption model: {name}") from None
+
+
+def adoption_curves(agents, years, start, steepness=STEEPNESS):
+    # Each agent's own model and parameters; agents without fitted parameters
+    # get the model's default curve ending at their integration year
+    years = np.asarray(years, dtype=float)
+    curves = np.zeros((len(agents), len(years)))
+    groups = {}
+    for i, agent in enumerate(agents):
+        groups.setdefault(agent.adoption_model, []).append(i)
+    for name, rows in groups.items():
+        model = get_model(name)
+        end_years = np.array([agents[i].integration_year for i in rows], dtype=float)
+        params = model.default_params(end_years, start, steepness)
+        for j, i in enumerate(rows):
+            if agents[i].adoption_params is not None:
+                params[j] = agents[i].adoption_params
+        curves[rows] = model.evaluate(params, years[None, :], start)
+    return curves
+
+
+def milestone_observations(agents):
+    # Milestone i of n (in year order) marks i / (n + 1) of the way to full
+    # adoption, which is reached at the integration year. Rows are padded to
+    # the longest agent with zero weights.
+    points = []
+    for agent in agents:
+        years = sorted(agent.yearly_milestones)
+        observed = [(year, 100 * (i + 1) / (len(years) + 1)) for i, year in enumerate(years)]
+        if agent.integration_year is not None:
+            observed.append((agent.integration_year, INTEGRATED_PROGRESS))
+        points.append(observed)
+    width = max((len(observed) for observed in points), default=0)
+    years = np.zeros((len(agents), width))
+    targets = np.zeros((len(agents), width))
+    weights = np.zeros((len(agents), width))
+    for i, observed in enumerate(points):
+        if observed:
+            years[i, :len(observed)], targets[i, :len(observed)] = zip(*observed)
+            weights[i, :len(observed)] = 1
+    return years, targets, weights
+
+
+def _residuals(model, free, years, targets, weights, start):
+    return (model.evaluate(model.from_free(free), years, start) - targets) * weights
+
+
+def fit_curves(model, years, targets, weights, initial, start):
+    # Levenberg-Marquardt run on every agent at once: each iteration builds the
+    # small per-agent normal equations with einsum and solves them as one
+    # stacked system. Converged agents drop out of later iterations.
+    model = get_model(model) if isinstance(model, str) else model
+    free = model.to_free(initial)
+    n_params = free.shape[1]
+    residual = _residuals(model, free, years, targets, weights, start)
+    cost = (residual ** 2).sum(axis=1)
+    damping = np.full(len(free), 1e-3)
+    active = np.flatnonzero(weights.any(axis=1))
+    identity = np.eye(n_params)
+
+    for _ in range(MAX_ITERATIONS):
+        if not len(active):
+            break
+        x = free[active]
+        r = residual[active]
+        args = (years[active], targets[active], weights[active], start)
+
+        # Forward-difference Jacobian, one extra evaluation per parameter
+        jacobian = np.empty(r.shape + (n_params,))
+        for j in range(n_params):
+            h = 1e-6 * np.maximum(1, np.abs(x[:, j]))
+            shifted = x.copy()
+            shifted[:, j] += h
+            jacobian[:, :, j] = (_residuals(model, shifted, *args) - r) / h[:, None]
+
+        jtj = np.einsum('amp,amq->apq', jacobian, jacobian)
+        jtr = np.einsum('amp,am->ap', jacobian, r)
+        scale = np.maximum(np.diagonal(jtj, axis1=1, axis2=2), 1e-12)
+        system = jtj + damping[active, None, None] * scale[:, :, None] * identity + 1e-12 * identity
+        step = np.linalg.solve(system, -jtr[:, :, None])[:, :, 0]
+        step *= np.minimum(1, _MAX_STEP / np.maximum(np.abs(step).max(axis=1, keepdims=True), 1e-300))
+
+        trial = x + step
+        trial_residual = _residuals(model, trial, *args)
+        trial_cost = (trial_residual ** 2).sum(axis=1)
+        improved = np.isfinite(trial_cost) & (trial_cost < cost[active])
+        gain = np.where(improved, cost[active] - trial_cost, 0)
+
+        accepted = active[improved]
+        free[accepted] = trial[improved]
+        residual[accepted] = trial_residual[improved]
+        cost[accepted] = trial_cost[improved]
+        damping[active] = np.where(improved, damping[active] / 3, damping[active] * 4)
+
+        done = (improved & (gain <= TOLERANCE * (1 + cost[active]))) | (damping[active] > 1e8)
+        active = active[~done]
+
+    return model.from_free(free), cost
+
+
+def _fit_chunk(name, years, targets, weights, initial, start):
+    return fit_curves(name, years, targets, weights, initial, start)[0]
+
+
+def fit_adoption_models(agents, model, start, steepness=STEEPNESS, processes=None):
+    # Fitted parameters for every agent as an (agents, params) array, starting
+    # from the model's default curve. Large populations are fitted in chunks
+    # across worker processes.
+    model = get_model(model)
+    years, targets, weights = milestone_observations(agents)
+    end_years = np.array([agent.integration_year for agent in agents], dtype=float)
+    initial = model.default_params(end_years, start, steepness)
+    if len(agents) < PARALLEL_THRESHOLD or processes == 1:
+        return fit_curves(model, years, targets, weights, initial, start)[0]
+
+    bounds = range(0, len(agents), CHUNK_SIZE)
+    with ProcessPoolExecutor(processes) as pool:
+        chunks = pool.map(_fit_chunk, *zip(*[
+            (model.name, years[i:i + CHUNK_SIZE], targets[i:i + CHUNK_SIZE],
+             weights[i:i + CHUNK_SIZE], initial[i:i + CHUNK_SIZE], start)
+            for i in bounds
+        ]))
+        return np.concatenate(list(chunks))
+
+
+def with_adoption_model(agents, model, start, processes=None):
+    # Copies of the agents carrying the fitted model, leaving the originals
+    # (which may be shared between sessions) untouched
+    params = fit_adoption_models(agents, model, start, processes=processes)
+    fitted = []
+    for agent, row in zip(agents, params):
+        agent = copy.copy(agent)
+        agent.set_adoption_model(model, tuple(float(value) for value in row))
+        fitted.append(agent)
+    return fitted
@@ -1,3 +1,6 @@
+from adoption_models import DEFAULT_MODEL, fit_adoption_models
+from timeline_data import START_YEAR, integration_progress
+
 class AIAgent:
     def __init__(self, name, domain, description):
         self.name = name
@@ -6,6 +9,9 @@ class AIAgent:
         self.predictions = []
         self.yearly_milestones = {}
         self.integration_year = None
+        self.sub_domain = None
+        self.adoption_model = DEFAULT_MODEL
+        self.adoption_params = None
 
     def set_predictions(self, predictions):
         self.predictions = predictions
@@ -16,6 +22,25 @@ class AIAgent:
     def set_yearly_milestones(self, milestones):
         self.yearly_milestones = milestones
 
+    def set_sub_domain(self, sub_domain):
+        # Groups agents within a domain; agents without one roll up to the domain itself
+        self.sub_domain = sub_domain
+
+    def set_adoption_model(self, model, params=None):
+        # A curve name from adoption_models.MODELS; without params the model's
+        # default curve ending at the integration year is used
+        self.adoption_model = model
+        self.adoption_params = params
+
+    def fit_adoption_model(self, model=None):
+        # For many agents, fit_adoption_models fits the whole batch at once
+        model = model or self.adoption_model
+        params = fit_adoption_models([self], model, START_YEAR)[0]
+        self.set_adoption_model(model, tuple(float(value) for value in params))
+
+    def adoption_progress(self, years):
+        return integration_progress([self], years)[0]
+
 class VisionAgent(AIAgent):
     def __init__(self):
         super().__init__(
@@ -172,3 +197,47 @@ def get_all_agents():
         CollaborationAgent(),
         TransparencyAgent()
     ]
+
+BLUEPRINT_PHASES = {
+    "Phase 1: Foundation": [
+        ("2025 Q1", "OpenAI-US Government Partnership Kickoff (Jan 30)"),
+        ("2025 Q2", "Launch of National AI Research Centers"),
+        ("2025 Q3", "Implementation of AI Safety Guidelines"),
+        ("2025 Q4", "Establishment of AI Economic Zones"),
+        ("2026 Q1", "Roll-out of AI Education Initiative"),
+        ("2026 Q2", "Public-Private AI Infrastructure Partnership"),
+        ("2026 Q4", "First Wave of AI Industry Standards"),
+        ("2027 Q2", "Completion of Initial AI Safety Framework")
+    ],
+    "Phase 2: Acceleration": [
+        ("2027 Q3", "Launch of AI Workforce Transition Program"),
+        ("2027 Q4", "Implementation of Cross-Border AI Collaboration"),
+        ("2028 Q1", "Deployment of AI-Enhanced Public Services"),
+        ("2028 Q3", "Establishment of AI Innovation Hubs"),
+        ("2028 Q4", "Roll-out of National AI Infrastructure"),
+        ("2029 Q2", "Integration of AI in Critical Industries")
+    ],
+    "Phase 3: Maturation": [
+        ("2029 Q3", "Achievement of AI Education Milestones"),
+        ("2029 Q4", "Full Implementation of AI Safety Standards"),
+        ("2030 Q1", "Completion of AI Economic Zone Network"),
+        ("2030 Q3", "Establishment of Global AI Partnership"),
+        ("2030 Q4", "Launch of Advanced AI Research Initiatives"),
+        ("2031 Q2", "Achievement of Full AI Integration Goals"),
+        ("2032 Q1", "Global AI Governance Framework"),
+        ("2032 Q4", "Advanced AI-Human Collaboration Systems"),
+        ("2033 Q2", "Universal AI Education Achievement"),
+        ("2034 Q1", "Quantum-AI Integration Milestone"),
+        ("2034 Q4", "Sustainable AI Infrastructure Complete"),
+        ("2035 Q2", "Full Societal AI Integration Achieved")
+    ]
+}
+
+def get_blueprint_phases():
+    return BLUEPRINT_PHASES
+
+def quarter_to_year(date_str):
+    # "2027 Q3" -> 2027.5
+    year = int(date_str.split()[0])
+    quarter = int(date_str.split()[1][1])
+    return year + (quarter - 1) * 0.25
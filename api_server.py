@@ -0,0 +1,435 @@
+import argparse
+import gzip
+import hashlib
+import json
+import selectors
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
+
+from ai_agents import get_all_agents
+from rollup_cube import HIERARCHY, RollupCube
+from timeline_data import TIME_LEVELS
+from timeline_lod import MAX_POINTS, MAX_TRACES, ProgressPyramid
+
+MIN_GZIP_SIZE = 512
+KEEP_ALIVE_TIMEOUT = 30  # Idle keep-alive connections are closed after this many seconds
+IDLE_SWEEP_INTERVAL = 1.0
+WINDOW_CACHE_SIZE = 256
+
+
+def build_payloads(cube):
+    progress = cube.progress('agent', time='quarter', at_start=True)
+    domains, years, counts = cube.milestone_counts('agent', time='year')
+    return {
+        '/api/progress': {
+            'years': progress['x'].tolist(),
+            'domains': domains,
+            'progress': progress['values'].round(4).tolist(),
+        },
+        '/api/heatmap': {
+            'years': [int(year) for year in years],
+            'domains': domains,
+            'counts': counts.tolist(),
+        },
+        '/api/relationships': {
+            'domains': domains,
+            'matrix': cube.relationships('agent')[1].tolist(),
+        },
+    }
+
+
+def selection(domain=None, sub_domain=None):
+    # The cube key of a domain / sub-domain query, None for everything
+    if sub_domain is not None and domain is None:
+        raise ValueError("sub_domain requires domain")
+    return (domain, sub_domain) if sub_domain is not None else (domain,) if domain is not None else None
+
+
+def rollup_payload(cube, level=None, domain=None, sub_domain=None, time='year'):
+    # One slice of the cube: the rows of `level` under the given domain and
+    # sub-domain, each with its integration-year statistics and time series.
+    # Without a level, the rows are the level just below the selection.
+    within = selection(domain, sub_domain)
+    if within is not None and within not in cube.index[HIERARCHY[len(within) - 1]]:
+        raise ValueError(f"Unknown {HIERARCHY[len(within) - 1]}: {' / '.join(within)}")
+    level = level or HIERARCHY[len(within or ())]
+    if HIERARCHY.index(level) < len(within or ()):
+        raise ValueError(f"level {level} is not below the selected group")
+    progress = cube.progress(level, within, time)
+    counts = cube.milestone_counts(level, within, time)[2]
+    rows = []
+    for i, stats in enumerate(cube.integration_stats(level, within)):
+        rows.append({
+            'key': list(stats.pop('Key')),
+            'label': stats.pop('Label'),
+            'agents': stats.pop('Agents'),
+            'integration_year': {name.lower(): round(value, 4) for name, value in stats.items()},
+            'milestones': counts[i].tolist(),
+            'progress': progress['values'][i].round(4).tolist(),
+        })
+    return {'level': level, 'within': list(within or ()), 'time': time, 'x': progress['x'].tolist(), 'rows': rows}
+
+
+class CachedResponse:
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(',', ':'), sort_keys=True, allow_nan=False).encode('utf-8')
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.gzip_body = gzip.compress(self.body, mtime=0) if len(self.body) >= MIN_GZIP_SIZE else None
+
+
+class ResponseCache:
+    # Responses are serialized, hashed and compressed once per refresh so a
+    # request only has to pick the right pre-encoded bytes.
+    def __init__(self, agents_factory=get_all_agents):
+        self._agents_factory = agents_factory
+        self._lock = threading.Lock()
+        self._responses = {}
+        self._cube = None
+        self._pyramid = None
+        self._views = OrderedDict()
+        self.refresh()
+
+    def refresh(self, agents=None):
+        if agents is None:
+            agents = self._agents_factory()
+        cube = RollupCube(agents)
+        payloads = build_payloads(cube)
+        responses = {path: CachedResponse(payload) for path, payload in payloads.items()}
+        responses['/api'] = CachedResponse({'endpoints': sorted(payloads) + ['/api/progress/window', '/api/rollup']})
+        with self._lock:
+            self._responses = responses
+            self._cube = cube
+            self._pyramid = ProgressPyramid(cube)
+            self._views.clear()
+
+    def get(self, path):
+        return self._responses.get(path)
+
+    def _view(self, key, build):
+        # Query responses built on demand and kept in a small LRU until the next refresh
+        with self._lock:
+            cube, pyramid = self._cube, self._pyramid
+            cached = self._views.get(key)
+            if cached is not None:
+                self._views.move_to_end(key)
+                return cached
+        cached = CachedResponse(build(cube, pyramid))
+        with self._lock:
+            if cube is self._cube:
+                self._views[key] = cached
+                while len(self._views) > WINDOW_CACHE_SIZE:
+                    self._views.popitem(last=False)
+        return cached
+
+    def window(self, start=None, end=None, domain=None, sub_domain=None, max_points=MAX_POINTS,
+               max_traces=MAX_TRACES):
+        # Detail for a zoomed x-range, as a Plotly relayout handler would request it
+        within = selection(domain, sub_domain)
+        return self._view(('window', start, end, within, max_points, max_traces),
+                          lambda cube, pyramid: pyramid.query(start, end, within, max_points, max_traces))
+
+    def rollup(self, level=None, domain=None, sub_domain=None, time='year'):
+        return self._view(('rollup', level, domain, sub_domain, time),
+                          lambda cube, pyramid: rollup_payload(cube, level, domain, sub_domain, time))
+
+
+def parse_window_query(query):
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    unknown = set(params) - {'start', 'end', 'domain', 'sub_domain', 'max_points', 'max_traces'}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    window = {}
+    for name in ('start', 'end'):
+        if name in params:
+            window[name] = float(params[name])
+    for name in ('max_points', 'max_traces'):
+        if name in params:
+            window[name] = int(params[name])
+            if window[name] < 1:
+                raise ValueError(f"{name} must be positive")
+    for name in ('domain', 'sub_domain'):
+        if name in params:
+            window[name] = params[name]
+    return window
+
+
+def parse_rollup_query(query):
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    unknown = set(params) - {'level', 'domain', 'sub_domain', 'time'}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    if params.get('level', HIERARCHY[0]) not in HIERARCHY:
+        raise ValueError(f"level must be one of {', '.join(HIERARCHY)}")
+    if params.get('time', 'year') not in dict(TIME_LEVELS):
+        raise ValueError(f"time must be one of {', '.join(dict(TIME_LEVELS))}")
+    return params
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    return etag in candidates or 'W/' + etag in candidates
+
+
+def accepts_gzip(header):
+    # An explicit gzip entry takes precedence over the * wildcard
+    qualities = {}
+    for coding in (header or '').split(','):
+        name, _, params = coding.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities.setdefault(name.strip().lower(), quality)
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+class TimelineRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive by default
+    server_version = 'AIIntegrationAPI/1.0'
+    timeout = 10  # A request that has started arriving must finish within this
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def __init__(self, request, client_address, server, rfile=None):
+        self.parked = False
+        self._resumed_rfile = rfile
+        super().__init__(request, client_address, server)
+
+    def setup(self):
+        super().setup()
+        if self._resumed_rfile is not None:
+            # Keep the reader of a resumed connection: it may hold read-ahead bytes
+            self.rfile.close()
+            self.rfile = self._resumed_rfile
+
+    def handle(self):
+        # Serve requests while they are already waiting. An idle connection is
+        # handed back to the server instead of holding this worker.
+        self.close_connection = False
+        while not self.close_connection:
+            pending = self._request_pending()
+            if pending is None:
+                return  # Closed or reset by the client
+            if not pending:
+                self.parked = True
+                self.server.park(self.connection, self.client_address, self.rfile)
+                return
+            self.handle_one_request()
+
+    def finish(self):
+        if not self.parked:
+            super().finish()
+
+    def _request_pending(self):
+        # Whether the next request has started arriving, checked without
+        # blocking: the buffered reader first, then the socket itself, which
+        # tells an idle connection from one the client closed (None)
+        self.connection.setblocking(False)
+        try:
+            if self.rfile.peek(1):
+                return True
+            return None if self.connection.recv(1, socket.MSG_PEEK) == b'' else True
+        except BlockingIOError:
+            return False
+        except OSError:
+            return None
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        path, _, query = self.path.partition('?')
+        path = path.rstrip('/') or '/api'
+        if path in ('/api/progress/window', '/api/rollup'):
+            try:
+                if path == '/api/rollup':
+                    cached = self.server.cache.rollup(**parse_rollup_query(query))
+                else:
+                    cached = self.server.cache.window(**parse_window_query(query))
+            except ValueError as e:
+                self._send_error_json(400, str(e))
+                return
+        else:
+            cached = self.server.cache.get(path)
+        if cached is None:
+            self._send_error_json(404, 'Not found')
+            return
+
+        if etag_matches(self.headers.get('If-None-Match'), cached.etag):
+            self.send_response(304)
+            self._send_cache_headers(cached)
+            self.end_headers()
+            return
+
+        body = cached.body
+        use_gzip = cached.gzip_body is not None and accepts_gzip(self.headers.get('Accept-Encoding'))
+        if use_gzip:
+            body = cached.gzip_body
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self._send_cache_headers(cached)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, cached):
+        self.send_header('ETag', cached.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+
+    def _send_error_json(self, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    # A fixed pool of worker threads serves requests instead of spawning a
+    # thread per connection. Workers only hold a connection while a request
+    # is arriving or being answered; idle keep-alive connections wait in a
+    # selector and go back to the pool when their next request arrives.
+    daemon_threads = True
+
+    def __init__(self, address, handler, cache, workers=32, verbose=False):
+        super().__init__(address, handler)
+        self.cache = cache
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-worker')
+        self._idle = selectors.DefaultSelector()
+        self._idle_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._idle_thread = threading.Thread(target=self._watch_idle, name='api-idle', daemon=True)
+        self._idle_thread.start()
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def finish_request(self, request, client_address, rfile=None):
+        return self.RequestHandlerClass(request, client_address, self, rfile)
+
+    def _process_request_worker(self, request, client_address, rfile=None):
+        handler = None
+        try:
+            handler = self.finish_request(request, client_address, rfile)
+        except Exception:
+            self.handle_error(request, client_address)
+        if handler is None or not handler.parked:
+            self.shutdown_request(request)
+
+    def park(self, request, client_address, rfile):
+        with self._idle_lock:
+            if self._closed.is_set():
+                rfile.close()
+                self.shutdown_request(request)
+                return
+            self._idle.register(request, selectors.EVENT_READ, (client_address, rfile, time.monotonic()))
+
+    def _unpark(self, request):
+        with self._idle_lock:
+            try:
+                return self._idle.unregister(request).data
+            except (KeyError, ValueError):
+                return None  # Already resumed or closed
+
+    def _watch_idle(self):
+        last_sweep = time.monotonic()
+        while not self._closed.is_set():
+            for key, _ in self._idle.select(timeout=IDLE_SWEEP_INTERVAL):
+                data = self._unpark(key.fileobj)
+                if data is None:
+                    continue
+                try:
+                    self._pool.submit(self._process_request_worker, key.fileobj, data[0], data[1])
+                except RuntimeError:  # Pool shut down at exit
+                    data[1].close()
+                    self.shutdown_request(key.fileobj)
+            now = time.monotonic()
+            if now - last_sweep >= IDLE_SWEEP_INTERVAL:
+                last_sweep = now
+                with self._idle_lock:
+                    expired = [key.fileobj for key in self._idle.get_map().values()
+                               if now - key.data[2] > KEEP_ALIVE_TIMEOUT]
+                for request in expired:
+                    self._close_parked(request)
+
+    def _close_parked(self, request):
+        data = self._unpark(request)
+        if data is not None:
+            data[1].close()
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._closed.set()
+        self._idle_thread.join()
+        with self._idle_lock:
+            parked = [key.fileobj for key in self._idle.get_map().values()]
+        for request in parked:
+            self._close_parked(request)
+        self._idle.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_server(host='127.0.0.1', port=8502, workers=32, verbose=False, cache=None):
+    return PooledHTTPServer((host, port), TimelineRequestHandler,
+                            cache or ResponseCache(), workers=workers, verbose=verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON API for computed AI integration timelines")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--verbose', action='store_true')
+    parser.add_argument('--events', help="follow this append-only milestone event file")
+    args = parser.parse_args()
+
+    cache = None
+    if args.events:
+        # Responses are rebuilt after every applied batch of events
+        from live_events import get_feed
+        feed = get_feed(args.events)
+        cache = ResponseCache(lambda: list(feed.snapshot().agents))
+        feed.add_listener(lambda snapshot, changed: cache.refresh(list(snapshot.agents)))
+        cache.refresh()  # Catch a batch applied before the listener was added
+    server = create_server(args.host, args.port, args.workers, args.verbose, cache)
+    print(f"Serving timeline API on http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from ai_agents import get_all_agents
+from adoption_models import MODELS, with_adoption_model
+from ai_agents import get_all_agents, get_blueprint_phases, quarter_to_year
+from milestone_alignment import align_agents_to_blueprint, schedule_deltas
+from milestone_graph import build_milestone_graph
+from forecast_snapshots import SnapshotStore
+from live_events import LiveCharts, default_feed, live_status
+from prediction_parser import prediction_events
+from session_memory import memory_report, record_session, session_object
+from rollup_cube import RollupCube
+from timeline_data import END_YEAR, START_YEAR
+from timeline_lod import MAX_BARS, MAX_TRACES, ProgressPyramid, timeline_rows
 import numpy as np
 
 st.set_page_config(page_title="AI Integration Analysis", layout="wide")
@@ -13,17 +23,9 @@ if 'investment_level' not in st.session_state:
 if 'public_trust' not in st.session_state:
     st.session_state.public_trust = 1.0
 
-def create_timeline(agents):
-    df = pd.DataFrame([
-        {
-            'Agent': agent.name.replace(' Agent', ''),  # Remove 'Agent' suffix for cleaner display
-            'Start Year': 2025,
-            'Integration Year': agent.integration_year,
-            'Domain': agent.domain,
-            'Description': agent.description
-        }
-        for agent in agents
-    ])
+def create_timeline(cube, level='agent', within=None):
+    # One bar per agent, or one summary bar per group for large populations
+    df = pd.DataFrame(timeline_rows(cube, level, within))
     
     fig = px.timeline(
         df.sort_values('Integration Year'),
@@ -89,24 +91,16 @@ def create_timeline(agents):
     
     return fig
 
-def create_predictions_chart(agents):
-    years = list(range(2025, 2035))
+def create_predictions_chart(cube):
     data = []
     
-    for agent in agents:
-        base_year = agent.integration_year
-        progress = []
-        for year in years:
-            if year >= 2025:
-                if year >= base_year:
-                    progress.append(100)
-                else:
-                    # Calculate progress as a percentage
-                    progress.append(((year - 2025) / (base_year - 2025)) * 100)
+    # Each agent's own adoption model, sampled yearly
+    view = cube.progress('agent', time='year', at_start=True)
+    for key, progress in zip(view['keys'], view['values']):
         data.append(go.Scatter(
-            x=years,
+            x=view['x'],
             y=progress,
-            name=agent.name,
+            name=key[2],
             mode='lines+markers'
         ))
     
@@ -119,49 +113,10 @@ def create_predictions_chart(agents):
     )
     return fig
 
-def create_blueprint_timeline():
+def create_blueprint_timeline(phases=None):
     # Create data for the timeline
-    phases = {
-        "Phase 1: Foundation": [
-            ("2025 Q1", "OpenAI-US Government Partnership Kickoff (Jan 30)"),
-            ("2025 Q2", "Launch of National AI Research Centers"),
-            ("2025 Q3", "Implementation of AI Safety Guidelines"),
-            ("2025 Q4", "Establishment of AI Economic Zones"),
-            ("2026 Q1", "Roll-out of AI Education Initiative"),
-            ("2026 Q2", "Public-Private AI Infrastructure Partnership"),
-            ("2026 Q4", "First Wave of AI Industry Standards"),
-            ("2027 Q2", "Completion of Initial AI Safety Framework")
-        ],
-        "Phase 2: Acceleration": [
-            ("2027 Q3", "Launch of AI Workforce Transition Program"),
-            ("2027 Q4", "Implementation of Cross-Border AI Collaboration"),
-            ("2028 Q1", "Deployment of AI-Enhanced Public Services"),
-            ("2028 Q3", "Establishment of AI Innovation Hubs"),
-            ("2028 Q4", "Roll-out of National AI Infrastructure"),
-            ("2029 Q2", "Integration of AI in Critical Industries")
-        ],
-        "Phase 3: Maturation": [
-            ("2029 Q3", "Achievement of AI Education Milestones"),
-            ("2029 Q4", "Full Implementation of AI Safety Standards"),
-            ("2030 Q1", "Completion of AI Economic Zone Network"),
-            ("2030 Q3", "Establishment of Global AI Partnership"),
-            ("2030 Q4", "Launch of Advanced AI Research Initiatives"),
-            ("2031 Q2", "Achievement of Full AI Integration Goals"),
-            ("2032 Q1", "Global AI Governance Framework"),
-            ("2032 Q4", "Advanced AI-Human Collaboration Systems"),
-            ("2033 Q2", "Universal AI Education Achievement"),
-            ("2034 Q1", "Quantum-AI Integration Milestone"),
-            ("2034 Q4", "Sustainable AI Infrastructure Complete"),
-            ("2035 Q2", "Full Societal AI Integration Achieved")
-        ]
-    }
+    phases = phases if phases is not None else get_blueprint_phases()
     
-    # Convert dates to numerical values for plotting
-    def date_to_num(date_str):
-        year = int(date_str.split()[0])
-        quarter = int(date_str.split()[1][1])
-        return year + (quarter - 1) * 0.25
-
     # Create DataFrame for plotting with waterfall offsets
     data = []
     colors = ['rgb(70, 130, 180)', 'rgb(30, 144, 255)', 'rgb(34, 139, 34)']
@@ -183,8 +138,8 @@ def create_blueprint_timeline():
                 'Phase': phase,
                 'Date': date,
                 'Milestone': milestone,
-                'DateNum': date_to_num(date),
-                'Color': colors[i],
+                'DateNum': quarter_to_year(date),
+                'Color': colors[i % len(colors)],
                 'YOffset': offset
             })
     
@@ -327,7 +282,7 @@ def display_agent_details(agents):
         
         st.markdown("---")  # Add separator between agents
 
-def generate_comparison_report():
+def generate_comparison_report(domain_deltas=None):
     report_content = """# AI Integration Approaches Comparison Report
 
 ## Executive Summary
@@ -411,25 +366,27 @@ Both approaches recognize the need for:
 ## Conclusion
 While the approaches differ in methodology and focus, they are complementary rather than contradictory. A successful AI integration strategy might combine the structured policy framework of the OpenAI-Gov approach with the domain-specific insights of the AI Agents' analysis.
 """
+    if domain_deltas is not None:
+        report_content += """
+## Appendix: Schedule Alignment by Domain
+Each agent milestone is matched to the closest blueprint milestone by text similarity and timing.
+Positive deltas mean the agents expect the milestone later than the blueprint.
+
+| Domain | Milestones | Mean Delta (years) | Median Delta (years) | Mean Text Similarity |
+|---|---|---|---|---|
+"""
+        for row in domain_deltas.itertuples(index=False):
+            report_content += f"| {row[0]} | {row[1]} | {row[2]:+.2f} | {row[3]:+.2f} | {row[4]:.2f} |\n"
     return report_content.encode('utf-8')
 
-def create_milestone_heatmap(agents):
+def create_milestone_heatmap(cube, level='agent', within=None):
     # Create data for milestone density
-    years = range(2025, 2036)
-    data = []
-    
-    for agent in agents:
-        row = []
-        for year in years:
-            # Count milestones per year
-            count = sum(1 for y in agent.yearly_milestones.keys() if y == year)
-            row.append(count)
-        data.append(row)
+    labels, years, data = cube.milestone_counts(cube.fit_level(level, within, MAX_BARS), within, 'year')
     
     fig = go.Figure(data=go.Heatmap(
         z=data,
-        x=list(years),
-        y=[agent.name.split(' Agent')[0] for agent in agents],
+        x=[int(year) for year in years],
+        y=labels,
         colorscale='Viridis',
         hoverongaps=False,
         hovertemplate='Year: %{x}<br>Domain: %{y}<br>Milestones: %{z}<extra></extra>'
@@ -447,21 +404,15 @@ def create_milestone_heatmap(agents):
     
     return fig
 
-def create_domain_relationships(agents):
+NODE_COLORS = ['rgb(31, 119, 180)', 'rgb(255, 127, 14)', 'rgb(44, 160, 44)',
+               'rgb(214, 39, 40)', 'rgb(148, 103, 189)', 'rgb(140, 86, 75)',
+               'rgb(227, 119, 194)']
+
+def create_domain_relationships(cube, level='agent', within=None):
     # Create relationship matrix based on shared milestones timing
-    n = len(agents)
-    matrix = np.zeros((n, n))
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                # Calculate relationship strength based on milestone proximity
-                strength = 0
-                for year_i in agents[i].yearly_milestones.keys():
-                    for year_j in agents[j].yearly_milestones.keys():
-                        if abs(year_i - year_j) <= 1:  # Related if milestones within 1 year
-                            strength += 1
-                matrix[i][j] = strength
+    labels, matrix = cube.relationships(cube.fit_level(level, within, MAX_TRACES), within)  # Related if milestones within 1 year
+    n = len(labels)
+    radius = 1
     
     # Create network graph
     edge_x = []
@@ -473,7 +424,6 @@ def create_domain_relationships(agents):
             if matrix[i][j] > 0:
                 angle_i = 2 * np.pi * i / n
                 angle_j = 2 * np.pi * j / n
-                radius = 1
                 
                 x0 = radius * np.cos(angle_i)
                 y0 = radius * np.sin(angle_i)
@@ -498,13 +448,11 @@ def create_domain_relationships(agents):
         x=node_x, y=node_y,
         mode='markers+text',
         hoverinfo='text',
-        text=[agent.name.split(' Agent')[0] for agent in agents],
+        text=labels,
         textposition="middle center",
         marker=dict(
             size=20,
-            color=['rgb(31, 119, 180)', 'rgb(255, 127, 14)', 'rgb(44, 160, 44)',
-                   'rgb(214, 39, 40)', 'rgb(148, 103, 189)', 'rgb(140, 86, 75)',
-                   'rgb(227, 119, 194)'][:n],
+            color=[NODE_COLORS[i % len(NODE_COLORS)] for i in range(n)],
             line=dict(color='white', width=1)
         )
     )
@@ -526,29 +474,13 @@ def create_domain_relationships(agents):
     
     return fig
 
-def create_integration_progress_chart(agents):
-    # Create data for cumulative progress
-    years = np.arange(2025, 2036, 0.25)  # Quarterly progress
-    domains = [agent.name.split(' Agent')[0] for agent in agents]
-    
-    # Calculate progress curves
-    progress_data = []
-    for agent in agents:
-        progress = []
-        start_year = 2025
-        end_year = agent.integration_year
-        
-        for year in years:
-            if year < start_year:
-                progress.append(0)
-            elif year > end_year:
-                progress.append(100)
-            else:
-                # Create S-curve for progress
-                x = (year - start_year) / (end_year - start_year)
-                progress.append(100 / (1 + np.exp(-10 * (x - 0.5))))
-        
-        progress_data.append(progress)
+def create_integration_progress_chart(cube, level='agent', within=None):
+    # Quarterly progress per agent; too many agents to draw individually are
+    # rolled up to sub-domain or domain averages
+    view = cube.progress(cube.fit_level(level, within, MAX_TRACES), within, 'quarter', at_start=True)
+    years = view['x']
+    domains = view['labels']
+    progress_data = view['values']
     
     fig = go.Figure()
     
@@ -596,174 +528,509 @@ def create_integration_progress_chart(agents):
     
     return fig
 
+def create_prediction_events_chart(agents):
+    df = pd.DataFrame(prediction_events(agents))
+    df['Domain'] = df['Agent'].str.split(' Agent').str[0]
+    df['Target'] = df['Percent'].map(lambda p: '' if pd.isna(p) else f"{p:g}%")
+    # Predictions share years with milestones, so nudge them apart
+    df['Position'] = df['Year'] + np.where(df['Type'] == 'Prediction', 0.2, 0.0)
+    
+    fig = px.scatter(
+        df,
+        x='Position',
+        y='Domain',
+        color='Type',
+        symbol='Type',
+        hover_data={'Event': True, 'Target': True, 'Year': True, 'Position': False, 'Type': False},
+        labels={'Position': 'Year'},
+        title='Milestones and Dated Predictions by Domain',
+        color_discrete_map={'Milestone': 'rgb(31, 119, 180)', 'Prediction': 'rgb(255, 127, 14)'},
+        symbol_map={'Milestone': 'circle', 'Prediction': 'diamond'}
+    )
+    
+    fig.update_traces(marker=dict(size=11, line=dict(color='white', width=1)))
+    fig.update_layout(
+        height=450,
+        font=dict(color='white'),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(dtick=1, tickformat='d', gridcolor='rgba(128,128,128,0.2)'),
+        yaxis=dict(title=None, gridcolor='rgba(128,128,128,0.2)')
+    )
+    
+    return fig
+
+def create_progress_detail_chart(view, x_range):
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    
+    for i, series in enumerate(view['series']):
+        color = colors[i % len(colors)]
+        if view['entity'] != 'agent':
+            # Shaded band spans the slowest to fastest agent in the group
+            fig.add_trace(go.Scatter(
+                x=view['x'] + view['x'][::-1],
+                y=series['upper'] + series['lower'][::-1],
+                fill='toself',
+                fillcolor=color,
+                opacity=0.2,
+                line=dict(width=0),
+                hoverinfo='skip',
+                showlegend=False
+            ))
+            name = f"{series['name']} ({series['agents']} agents)"
+        else:
+            name = series['name']
+        fig.add_trace(go.Scatter(
+            x=view['x'],
+            y=series['values'],
+            name=name,
+            mode='lines',
+            line=dict(width=2, color=color),
+            hovertemplate='Year: %{x:.2f}<br>Progress: %{y:.1f}%<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title=f"Integration Progress Detail ({view['entity'].replace('_', '-')} level, {view['level']}ly points)",
+        xaxis_title='Year',
+        yaxis_title='Integration Progress (%)',
+        height=400,
+        font=dict(color='white'),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(gridcolor='rgba(128,128,128,0.2)', range=[0, 100]),
+        xaxis=dict(gridcolor='rgba(128,128,128,0.2)', range=list(x_range)),
+        hovermode='x unified'
+    )
+    
+    return fig
+
+CUBE_FIELDS = ['milestones', 'integration_year']  # What the rollup cube is built from
+
+def shared_cube(live, agents):
+    # The aggregates every chart reads, built once per version of the agents
+    return session_object(live.key('rollup_cube', CUBE_FIELDS), 'agents', lambda: RollupCube(agents))
+
+def drill_down_scopes(cube):
+    scopes = {"All domains": None}
+    scopes.update({key[0]: key for key in cube.keys['domain']})
+    scopes.update({f"{key[0]} / {key[1]}": key for key in cube.keys['sub_domain'] if key[1] != key[0]})
+    return scopes
+
+def select_drill_down(cube):
+    col1, col2 = st.columns(2)
+    with col1:
+        level_labels = {"Agent": 'agent', "Sub-domain": 'sub_domain', "Domain": 'domain'}
+        level = level_labels[st.selectbox("Group charts by", list(level_labels))]
+    with col2:
+        scopes = drill_down_scopes(cube)
+        within = scopes[st.selectbox("Drill into", list(scopes))]
+    return level, within
+
+def display_progress_explorer(live):
+    scopes = drill_down_scopes(shared_cube(live, live.agents))
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        x_range = st.slider("Year range", min_value=float(START_YEAR), max_value=float(END_YEAR + 1),
+                            value=(float(START_YEAR), float(END_YEAR + 1)), step=1 / 12, format="%.2f")
+    with col2:
+        within = scopes[st.selectbox("Domain", list(scopes))]
+    
+    def draw(container):
+        # Only the points inside the selected window are built and sent
+        pyramid = ProgressPyramid(shared_cube(live, live.agents))
+        view = pyramid.query(*x_range, within)
+        container.plotly_chart(create_progress_detail_chart(view, x_range), use_container_width=True, theme="streamlit")
+    live.chart(['integration_year'], draw)
+
+def create_schedule_delta_chart(domain_deltas):
+    fig = go.Figure(go.Bar(
+        x=domain_deltas['Mean Delta Years'],
+        y=domain_deltas['Domain'],
+        orientation='h',
+        marker=dict(color=np.where(domain_deltas['Mean Delta Years'] > 0, 'rgb(214, 39, 40)', 'rgb(44, 160, 44)')),
+        customdata=domain_deltas[['Milestones', 'Mean Text Similarity']],
+        hovertemplate='<b>%{y}</b><br>Mean delta: %{x:+.2f} years<br>' +
+                      'Milestones: %{customdata[0]}<br>Mean similarity: %{customdata[1]:.2f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title='Agent vs Blueprint Schedule Delta by Domain',
+        xaxis_title='Mean Delta (years, positive = agents later)',
+        height=400,
+        font=dict(color='white'),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(128,128,128,0.2)', zeroline=True, zerolinecolor='white'),
+        yaxis=dict(title=None)
+    )
+    
+    return fig
+
+def create_progress_overlay_chart(cube, previous_cube, version_label):
+    fig = create_integration_progress_chart(cube)
+    
+    # Previous forecast drawn as dashed lines in the matching colors. Colors
+    # are keyed by series name: snapshots load agents in a different order.
+    palette = px.colors.qualitative.Plotly
+    previous = previous_cube.progress(previous_cube.fit_level('agent', None, MAX_TRACES), None, 'quarter',
+                                       at_start=True)
+    colors = {}
+    for label in [trace.name for trace in fig.data] + previous['labels']:
+        colors.setdefault(label, palette[len(colors) % len(palette)])
+    for trace in fig.data:
+        trace.line.color = colors[trace.name]
+    for i, label in enumerate(previous['labels']):
+        fig.add_trace(go.Scatter(
+            x=previous['x'],
+            y=previous['values'][i],
+            name=f"{label} ({version_label})",
+            mode='lines',
+            line=dict(width=1, dash='dash', color=colors[label]),
+            hovertemplate='Year: %{x:.2f}<br>Progress: %{y:.1f}%<extra></extra>'
+        ))
+    
+    fig.update_layout(title=f'Integration Progress: Current vs {version_label}')
+    return fig
+
+def commit_snapshot(store, agents):
+    try:
+        return store.commit(agents)
+    except OSError:
+        return None
+
+def display_forecast_history(live, agents, cube):
+    # The store, the commit of each agent version, each snapshot's cube and
+    # each diff are built once per process and shared by every rerun
+    store = session_object('snapshot_store', 'agents', SnapshotStore)
+    current_version = session_object(live.key('snapshot_commit'), 'agents', lambda: commit_snapshot(store, agents))
+    if current_version is None:
+        st.caption("Forecast snapshots are unavailable (snapshot store is not writable).")
+        return
+    
+    previous = [entry for entry in store.log() if entry['version'] != current_version]
+    if not previous:
+        st.caption("No earlier forecast snapshots recorded yet.")
+        return
+    
+    options = {
+        f"{entry['version'][:12]} {entry['label']}".strip(): entry['version']
+        for entry in reversed(previous)
+    }
+    selected = st.selectbox("Compare current forecasts with snapshot", list(options))
+    version = options[selected]
+    
+    # Versions are content hashes, so objects keyed by them never go stale
+    previous_cube = session_object(f'snapshot_cube:{version}', 'agents',
+                                   lambda: RollupCube(store.load_agents(version)))
+    overlay_fig = session_object(live.key(f'progress_overlay_{version}', CUBE_FIELDS), 'figures',
+                                 lambda: create_progress_overlay_chart(cube, previous_cube, selected.split()[0]))
+    st.plotly_chart(overlay_fig, use_container_width=True, theme="streamlit")
+    
+    changes_df = session_object(f'snapshot_diff:{version}:{current_version}', 'dataframes',
+                                lambda: snapshot_changes(store, version, current_version))
+    if changes_df is not None:
+        st.dataframe(changes_df, use_container_width=True)
+    else:
+        st.markdown("No forecast changes between these snapshots.")
+
+def snapshot_changes(store, old_version, new_version):
+    changes = store.diff(old_version, new_version)
+    if not changes:
+        return None
+    changes_df = pd.DataFrame(changes)
+    # Old/New mix years and text; show them as text
+    for column in ('Key', 'Old', 'New'):
+        changes_df[column] = changes_df[column].map(lambda value: '' if value is None else str(value))
+    return changes_df
+
+def display_memory_report(report):
+    mb = 2 ** 20
+    st.markdown(f"**Resident memory:** {report['rss_bytes'] / mb:.1f} MB across "
+                f"{report['session_count']} active session(s)")
+    if not report['tracking']:
+        st.caption("Set SESSION_MEMORY_TRACKING=1 to measure memory by component.")
+        return
+    
+    shared = {component: size / mb for component, size in report['shared'].items()}
+    st.markdown("**Shared across sessions (MB):** " +
+                ", ".join(f"{component} {size:.2f}" for component, size in shared.items()))
+    rows = [
+        {'Session': session_id[:8],
+         **{component: size / mb for component, size in info['components'].items()},
+         'Total MB': info['total'] / mb,
+         'Evictions': info['evictions']}
+        for session_id, info in report['sessions'].items()
+    ]
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    
+    samples = pd.DataFrame(report['samples'], columns=['Time', 'Sessions', 'RSS'])
+    samples['RSS MB'] = samples['RSS'] / mb
+    st.plotly_chart(px.scatter(samples, x='Sessions', y='RSS MB',
+                               title='Resident Memory vs Active Sessions'),
+                    use_container_width=True, theme="streamlit")
+
+ABOUT_MARKDOWN = """
+### About This Dashboard
+This dashboard presents two distinct approaches to AI integration in America:
+1. **AI Agents' Independent Analysis**: Our specialized AI agents provide their expert analysis and timeline predictions
+for AI integration across different sectors, based on comprehensive analysis of technological, social, and policy factors.
+2. **OpenAI-US Government Blueprint**: The official roadmap from the OpenAI-US Government partnership, launched in January 2025.
+
+Compare these approaches to understand different perspectives on America's AI integration journey.
+"""
+
+TIMELINE_MARKDOWN = """
+This timeline shows when each sector is expected to achieve complete AI integration, according to our
+specialized AI agents' independent analysis. Each agent focuses on a specific domain and provides expert
+predictions based on current trends, technological capabilities, and societal factors.
+
+**How to Read the Timeline:**
+- Each bar represents an AI agent's domain
+- The length shows the integration journey from 2025 to predicted completion
+- Colors indicate different sectors of society and economy
+- The dashed yellow line marks the present year (2025)
+"""
+
+VISUALIZATIONS_MARKDOWN = """
+### Understanding the Visualizations
+
+**Integration Progress Chart**
+Shows the projected progress of AI integration for each domain over time,
+following an S-curve pattern typical of technology adoption.
+
+**Milestone Density Heatmap**
+Displays the concentration of milestones across different domains and years,
+helping identify periods of intense development.
+
+**Domain Relationships Network**
+Illustrates the interconnections between different domains based on the timing
+of their milestones, showing how progress in one area may influence others.
+"""
+
+EXPLORER_MARKDOWN = """
+Narrow the year range to see finer detail. Wide ranges show quarterly or yearly points, and
+large populations are summarised by domain with a band from the slowest to the fastest agent.
+"""
+
+AGENT_DETAILS_MARKDOWN = """
+Below are detailed predictions and analysis from each AI agent, providing specialized insights
+based on their domain expertise.
+"""
+
+BLUEPRINT_MARKDOWN = """
+This is the official implementation roadmap developed by the OpenAI-US Government partnership.
+It represents a structured, policy-driven approach to AI integration with defined phases and milestones.
+"""
+
+BLUEPRINT_DETAILS_MARKDOWN = """
+### Phase 1: Foundation Building (2025-2027)
+- **2025 Q1:** OpenAI-US Government Partnership Kickoff (January 30)
+- **2025 Q2:** Launch of National AI Research Centers
+- **2025 Q3:** Implementation of AI Safety Guidelines
+- **2025 Q4:** Establishment of AI Economic Zones in pilot cities
+- **2026 Q1:** Roll-out of AI Education Initiative
+- **2026 Q2:** Launch of Public-Private AI Infrastructure Partnership
+- **2026 Q4:** First Wave of AI Industry Standards
+- **2027 Q2:** Completion of Initial AI Safety Framework
+
+### Phase 2: Acceleration (2027-2029)
+- **2027 Q3:** Launch of AI Workforce Transition Program
+- **2027 Q4:** Implementation of Cross-Border AI Collaboration
+- **2028 Q1:** Deployment of AI-Enhanced Public Services
+- **2028 Q3:** Establishment of AI Innovation Hubs
+- **2028 Q4:** Roll-out of National AI Infrastructure
+- **2029 Q2:** Integration of AI in Critical Industries
+
+### Phase 3: Maturation (2029-2035)
+- **2029 Q3:** Achievement of AI Education Milestones
+- **2029 Q4:** Full Implementation of AI Safety Standards
+- **2030 Q1:** Completion of AI Economic Zone Network
+- **2030 Q3:** Establishment of Global AI Partnership
+- **2030 Q4:** Launch of Advanced AI Research Initiatives
+- **2031 Q2:** Achievement of Full AI Integration Goals
+- **2032 Q1:** Global AI Governance Framework
+- **2032 Q4:** Advanced AI-Human Collaboration Systems
+- **2033 Q2:** Universal AI Education Achievement
+- **2034 Q1:** Quantum-AI Integration Milestone
+- **2034 Q4:** Sustainable AI Infrastructure Complete
+- **2035 Q2:** Full Societal AI Integration Achieved
+"""
+
+COMPARISON_MARKDOWN = """
+### Key Differences in Approaches
+
+#### Timeline and Pacing
+- **AI Agents**: Focus on sector-specific integration with varying timelines based on domain complexity
+- **OpenAI-Gov**: Structured three-phase approach with synchronized milestones across sectors
+
+#### Integration Strategy
+- **AI Agents**: Bottom-up approach focusing on technological readiness and sector-specific needs
+- **OpenAI-Gov**: Top-down approach emphasizing policy framework and coordinated implementation
+
+#### Priority Areas
+- **AI Agents**: Emphasizes practical implementation and domain expertise
+- **OpenAI-Gov**: Prioritizes infrastructure, governance, and standardization
+
+#### Risk Management
+- **AI Agents**: Domain-specific risk assessment and mitigation
+- **OpenAI-Gov**: Comprehensive safety framework and phased deployment
+
+### Areas of Agreement
+- Both approaches recognize the need for:
+  - Strong safety guidelines and ethical considerations
+  - Public-private partnerships
+  - Education and workforce development
+  - Global collaboration
+
+### Notable Insights
+- The AI Agents' approach provides more granular, sector-specific insights
+- The OpenAI-Gov blueprint offers a more coordinated, policy-driven framework
+- Both timelines converge on full integration around 2035
+"""
+
+ALIGNMENT_MARKDOWN = """
+Each agent milestone is matched to its closest blueprint milestone by text similarity and timing.
+Positive deltas mean the agents expect the milestone later than the blueprint.
+"""
+
 def main():
     st.title("AI Integration in America Analysis Dashboard")
     
-    # Add description
-    st.markdown("""
-    ### About This Dashboard
-    This dashboard presents two distinct approaches to AI integration in America:
-    1. **AI Agents' Independent Analysis**: Our specialized AI agents provide their expert analysis and timeline predictions 
-    for AI integration across different sectors, based on comprehensive analysis of technological, social, and policy factors.
-    2. **OpenAI-US Government Blueprint**: The official roadmap from the OpenAI-US Government partnership, launched in January 2025.
+    # In live mode (LIVE_EVENTS_FILE set) agents come from the event feed and
+    # charts are redrawn in place as events arrive
+    live = LiveCharts(default_feed(), lambda: session_object('agents', 'agents', get_all_agents))
+    status = st.empty()
+    if live.feed is not None:
+        status.caption(live_status(live.snapshot))
     
-    Compare these approaches to understand different perspectives on America's AI integration journey.
-    """)
+    # Add description
+    st.markdown(ABOUT_MARKDOWN)
     
     # Create tabs for different views
     tab1, tab2, tab3 = st.tabs(["AI Agents' Timeline", "OpenAI-US Gov Blueprint", "Approach Comparison"])
     
     with tab1:
         st.header("AI Agents' Integration Timeline")
-        st.markdown("""
-        This timeline shows when each sector is expected to achieve complete AI integration, according to our 
-        specialized AI agents' independent analysis. Each agent focuses on a specific domain and provides expert 
-        predictions based on current trends, technological capabilities, and societal factors.
-        
-        **How to Read the Timeline:**
-        - Each bar represents an AI agent's domain
-        - The length shows the integration journey from 2025 to predicted completion
-        - Colors indicate different sectors of society and economy
-        - The dashed yellow line marks the present year (2025)
-        """)
+        st.markdown(TIMELINE_MARKDOWN)
         
         # Get agents data
-        agents = get_all_agents()
+        agents = live.agents
+        
+        # Charts below can be rolled up to sub-domains or domains and narrowed to one group
+        level, within = select_drill_down(shared_cube(live, agents))
+        scope = f"[{level}:{'/'.join(within) if within else '*'}]"
         
         # Main timeline
-        timeline_fig = create_timeline(agents)
-        st.plotly_chart(timeline_fig, use_container_width=True, theme="streamlit")
+        live.figure(f'timeline_figure{scope}', ['integration_year'],
+                    lambda agents: create_timeline(shared_cube(live, agents), level, within))
         
         # Create two columns for additional charts
         col1, col2 = st.columns(2)
         
         with col1:
-            # Integration progress chart
-            progress_fig = create_integration_progress_chart(agents)
-            st.plotly_chart(progress_fig, use_container_width=True, theme="streamlit")
+            # Integration progress chart, optionally with curves fitted to each agent's milestones
+            model_labels = {"Default S-curve": None}
+            model_labels.update({f"{model.label} fit": name for name, model in MODELS.items()})
+            model = model_labels[st.selectbox("Adoption model", list(model_labels))]
+            if model is None:
+                live.figure(f'progress_figure_default{scope}', ['integration_year'],
+                            lambda agents: create_integration_progress_chart(shared_cube(live, agents), level, within))
+            else:
+                live.figure(f'progress_figure_{model}{scope}', CUBE_FIELDS, lambda agents: create_integration_progress_chart(
+                    session_object(live.key(f'rollup_cube_{model}', CUBE_FIELDS), 'agents',
+                                   lambda: RollupCube(with_adoption_model(agents, model, START_YEAR))),
+                    level, within
+                ))
             
             # Milestone heatmap
-            heatmap_fig = create_milestone_heatmap(agents)
-            st.plotly_chart(heatmap_fig, use_container_width=True, theme="streamlit")
+            live.figure(f'heatmap_figure{scope}', ['milestones'],
+                        lambda agents: create_milestone_heatmap(shared_cube(live, agents), level, within))
         
         with col2:
             # Domain relationships network
-            network_fig = create_domain_relationships(agents)
-            st.plotly_chart(network_fig, use_container_width=True, theme="streamlit")
+            live.figure(f'network_figure{scope}', ['milestones'],
+                        lambda agents: create_domain_relationships(shared_cube(live, agents), level, within))
             
             # Add chart descriptions
-            st.markdown("""
-            ### Understanding the Visualizations
-            
-            **Integration Progress Chart**
-            Shows the projected progress of AI integration for each domain over time, 
-            following an S-curve pattern typical of technology adoption.
-            
-            **Milestone Density Heatmap**
-            Displays the concentration of milestones across different domains and years, 
-            helping identify periods of intense development.
-            
-            **Domain Relationships Network**
-            Illustrates the interconnections between different domains based on the timing 
-            of their milestones, showing how progress in one area may influence others.
-            """)
+            st.markdown(VISUALIZATIONS_MARKDOWN)
+        
+        # Zoomable progress detail
+        st.header("Explore Integration Progress")
+        st.markdown(EXPLORER_MARKDOWN)
+        display_progress_explorer(live)
+        
+        # Milestones and predictions on a shared timeline
+        live.figure('events_figure', ['milestones', 'predictions'], create_prediction_events_chart)
+        
+        # Forecast history
+        st.header("Forecast History")
+        display_forecast_history(live, agents, shared_cube(live, agents))
         
         # Agent details section
         st.header("Detailed Agent Predictions")
-        st.markdown("""
-        Below are detailed predictions and analysis from each AI agent, providing specialized insights 
-        based on their domain expertise.
-        """)
+        st.markdown(AGENT_DETAILS_MARKDOWN)
         display_agent_details(agents)
 
     with tab2:
         st.header("OpenAI-US Government Blueprint Timeline")
-        st.markdown("""
-        This is the official implementation roadmap developed by the OpenAI-US Government partnership. 
-        It represents a structured, policy-driven approach to AI integration with defined phases and milestones.
-        """)
+        st.markdown(BLUEPRINT_MARKDOWN)
         
         # Display the blueprint timeline
-        blueprint_timeline = create_blueprint_timeline()
+        blueprint_timeline = session_object('blueprint_figure', 'figures', create_blueprint_timeline)
         st.plotly_chart(blueprint_timeline, use_container_width=True, theme="streamlit")
         
         # Display detailed timeline in an expander
         with st.expander("View Detailed Timeline"):
-            st.markdown("""
-            ### Phase 1: Foundation Building (2025-2027)
-            - **2025 Q1:** OpenAI-US Government Partnership Kickoff (January 30)
-            - **2025 Q2:** Launch of National AI Research Centers
-            - **2025 Q3:** Implementation of AI Safety Guidelines
-            - **2025 Q4:** Establishment of AI Economic Zones in pilot cities
-            - **2026 Q1:** Roll-out of AI Education Initiative
-            - **2026 Q2:** Launch of Public-Private AI Infrastructure Partnership
-            - **2026 Q4:** First Wave of AI Industry Standards
-            - **2027 Q2:** Completion of Initial AI Safety Framework
-            
-            ### Phase 2: Acceleration (2027-2029)
-            - **2027 Q3:** Launch of AI Workforce Transition Program
-            - **2027 Q4:** Implementation of Cross-Border AI Collaboration
-            - **2028 Q1:** Deployment of AI-Enhanced Public Services
-            - **2028 Q3:** Establishment of AI Innovation Hubs
-            - **2028 Q4:** Roll-out of National AI Infrastructure
-            - **2029 Q2:** Integration of AI in Critical Industries
-            
-            ### Phase 3: Maturation (2029-2035)
-            - **2029 Q3:** Achievement of AI Education Milestones
-            - **2029 Q4:** Full Implementation of AI Safety Standards
-            - **2030 Q1:** Completion of AI Economic Zone Network
-            - **2030 Q3:** Establishment of Global AI Partnership
-            - **2030 Q4:** Launch of Advanced AI Research Initiatives
-            - **2031 Q2:** Achievement of Full AI Integration Goals
-            - **2032 Q1:** Global AI Governance Framework
-            - **2032 Q4:** Advanced AI-Human Collaboration Systems
-            - **2033 Q2:** Universal AI Education Achievement
-            - **2034 Q1:** Quantum-AI Integration Milestone
-            - **2034 Q4:** Sustainable AI Infrastructure Complete
-            - **2035 Q2:** Full Societal AI Integration Achieved
-            """)
+            st.markdown(BLUEPRINT_DETAILS_MARKDOWN)
     
     with tab3:
         st.header("Approach Comparison Analysis")
-        st.markdown("""
-        ### Key Differences in Approaches
-        
-        #### Timeline and Pacing
-        - **AI Agents**: Focus on sector-specific integration with varying timelines based on domain complexity
-        - **OpenAI-Gov**: Structured three-phase approach with synchronized milestones across sectors
+        st.markdown(COMPARISON_MARKDOWN)
         
-        #### Integration Strategy
-        - **AI Agents**: Bottom-up approach focusing on technological readiness and sector-specific needs
-        - **OpenAI-Gov**: Top-down approach emphasizing policy framework and coordinated implementation
+        # Milestone-level alignment between the two approaches
+        st.subheader("Schedule Alignment")
+        st.markdown(ALIGNMENT_MARKDOWN)
+        def alignment_for(agents):
+            return session_object(live.key('alignment_matches', ['milestones']), 'dataframes',
+                                  lambda: align_agents_to_blueprint(agents))
         
-        #### Priority Areas
-        - **AI Agents**: Emphasizes practical implementation and domain expertise
-        - **OpenAI-Gov**: Prioritizes infrastructure, governance, and standardization
+        def deltas_for(agents):
+            return session_object(live.key('alignment_deltas', ['milestones']), 'dataframes',
+                                  lambda: schedule_deltas(alignment_for(agents)))
         
-        #### Risk Management
-        - **AI Agents**: Domain-specific risk assessment and mitigation
-        - **OpenAI-Gov**: Comprehensive safety framework and phased deployment
+        live.figure('alignment_figure', ['milestones'], lambda agents: create_schedule_delta_chart(deltas_for(agents)))
+        alignment = alignment_for(agents)
+        domain_deltas = deltas_for(agents)
+        with st.expander("View Milestone Matches"):
+            st.dataframe(alignment.drop(columns=['Rank']), use_container_width=True)
         
-        ### Areas of Agreement
-        - Both approaches recognize the need for:
-          - Strong safety guidelines and ethical considerations
-          - Public-private partnerships
-          - Education and workforce development
-          - Global collaboration
-        
-        ### Notable Insights
-        - The AI Agents' approach provides more granular, sector-specific insights
-        - The OpenAI-Gov blueprint offers a more coordinated, policy-driven framework
-        - Both timelines converge on full integration around 2035
-        """)
+        # Cross-domain dependency schedule
+        with st.expander("View Milestone Dependencies and Critical Path"):
+            milestone_graph = session_object(live.key('milestone_graph', ['milestones']), 'agents',
+                                             lambda: build_milestone_graph(agents))
+            st.markdown(f"**Projected completion:** {milestone_graph.project_end:.2f}")
+            st.markdown("**Critical path:** " + " → ".join(milestone_graph.critical_path()))
+            schedule_df = session_object(live.key('schedule_dataframe', ['milestones']), 'dataframes',
+                                         lambda: pd.DataFrame(milestone_graph.to_records()))
+            st.dataframe(schedule_df, use_container_width=True)
         
         # Add downloadable report option
         st.download_button(
             label="📥 Download Full Comparison Report",
-            data=generate_comparison_report(),
+            data=session_object(live.key('comparison_report', ['milestones']), 'report',
+                                lambda: generate_comparison_report(domain_deltas)),
             file_name="ai_integration_approaches_comparison.md",
             mime="text/markdown"
         )
+    
+    record_session()
+    with st.expander("Server Memory Usage"):
+        display_memory_report(memory_report())
+    
+    if live.feed is not None:
+        live.follow(lambda snapshot: status.caption(live_status(snapshot)))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,272 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from adoption_models import DEFAULT_MODEL
+from ai_agents import AIAgent, get_all_agents, get_blueprint_phases
+
+# Outside the source tree by default: every dashboard load may write here
+DEFAULT_STORE = os.environ.get(
+    'FORECAST_SNAPSHOT_DIR',
+    os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share'),
+                 'ai-integration-analysis', 'forecast_snapshots')
+)
+
+
+def agent_to_record(agent):
+    record = {
+        'name': agent.name,
+        'domain': agent.domain,
+        'description': agent.description,
+        'integration_year': agent.integration_year,
+        'predictions': list(agent.predictions),
+        'yearly_milestones': {str(year): text for year, text in sorted(agent.yearly_milestones.items())},
+    }
+    # Only non-default values are recorded so existing snapshot hashes still match
+    if agent.sub_domain is not None:
+        record['sub_domain'] = agent.sub_domain
+    if agent.adoption_model != DEFAULT_MODEL or agent.adoption_params is not None:
+        record['adoption_model'] = agent.adoption_model
+        record['adoption_params'] = list(agent.adoption_params) if agent.adoption_params is not None else None
+    return record
+
+
+def record_to_agent(record):
+    agent = AIAgent(record['name'], record['domain'], record['description'])
+    agent.set_predictions(list(record['predictions']))
+    agent.set_yearly_milestones({int(year): text for year, text in record['yearly_milestones'].items()})
+    agent.set_integration_year(record['integration_year'])
+    agent.set_sub_domain(record.get('sub_domain'))
+    if 'adoption_model' in record:
+        params = record['adoption_params']
+        agent.set_adoption_model(record['adoption_model'], tuple(params) if params is not None else None)
+    return agent
+
+
+def encode(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotStore:
+    # Every agent and blueprint phase is stored once under the hash of its
+    # content; a version is a small manifest of those hashes, so versions
+    # share every object that did not change.
+    def __init__(self, root=DEFAULT_STORE):
+        self.root = root
+        self._objects_dir = os.path.join(root, 'objects')
+        self._log_path = os.path.join(root, 'log.jsonl')
+        self._cache = {}
+        self._log_cache = None
+
+    def _object_path(self, digest):
+        return os.path.join(self._objects_dir, digest[:2], digest[2:] + '.json')
+
+    def _put(self, obj):
+        data = encode(obj)
+        digest = content_hash(data)
+        if digest not in self._cache:
+            path = self._object_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # A unique temporary name: sessions are threads of one process
+                fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            self._cache[digest] = obj
+        return digest
+
+    def get_object(self, digest):
+        obj = self._cache.get(digest)
+        if obj is None:
+            try:
+                with open(self._object_path(digest), 'rb') as f:
+                    obj = json.loads(f.read())
+            except FileNotFoundError:
+                raise KeyError(f"Unknown snapshot object: {digest}") from None
+            self._cache[digest] = obj
+        return obj
+
+    def commit(self, agents, phases=None, label=None):
+        if phases is None:
+            phases = get_blueprint_phases()
+        manifest = {
+            'agents': {agent.name: self._put(agent_to_record(agent)) for agent in agents},
+            'phases': {phase: self._put([list(m) for m in milestones])
+                       for phase, milestones in phases.items()},
+        }
+        version = self._put(manifest)
+        head = self.head()
+        # An unchanged version still gets an entry when it is given a new label
+        if head is None or head['version'] != version or (label and head['label'] != label):
+            entry = {'version': version, 'label': label or '', 'created': time.time()}
+            os.makedirs(self.root, exist_ok=True)
+            with open(self._log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        return version
+
+    def log(self):
+        # Re-read only when the file changed; other processes append to it too
+        try:
+            stat = os.stat(self._log_path)
+        except FileNotFoundError:
+            return []
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = self._log_cache
+        if cached is None or cached[0] != key:
+            with open(self._log_path, encoding='utf-8') as f:
+                cached = self._log_cache = (key, [json.loads(line) for line in f if line.strip()])
+        return list(cached[1])
+
+    def head(self):
+        entries = self.log()
+        return entries[-1] if entries else None
+
+    def resolve(self, ref):
+        # Accept a full version hash, a unique prefix, or a label
+        entries = self.log()
+        for entry in reversed(entries):
+            if entry['label'] and entry['label'] == ref:
+                return entry['version']
+        matches = {entry['version'] for entry in entries if entry['version'].startswith(ref)}
+        if len(matches) != 1:
+            raise KeyError(f"Unknown or ambiguous snapshot: {ref}")
+        return matches.pop()
+
+    def manifest(self, version):
+        return self.get_object(self.resolve(version))
+
+    def load_agents(self, version):
+        manifest = self.manifest(version)
+        return [record_to_agent(self.get_object(digest)) for digest in manifest['agents'].values()]
+
+    def load_phases(self, version):
+        manifest = self.manifest(version)
+        return {phase: [tuple(m) for m in self.get_object(digest)]
+                for phase, digest in manifest['phases'].items()}
+
+    def diff(self, old_version, new_version):
+        old = self.manifest(old_version)
+        new = self.manifest(new_version)
+        changes = []
+        # Identical hashes mean identical content, so only changed entries are opened
+        for name, old_digest, new_digest in _changed_entries(old['agents'], new['agents']):
+            changes.extend(_diff_agent(name,
+                                       self.get_object(old_digest) if old_digest else None,
+                                       self.get_object(new_digest) if new_digest else None))
+        for phase, old_digest, new_digest in _changed_entries(old['phases'], new['phases']):
+            changes.extend(_diff_phase(phase,
+                                       self.get_object(old_digest) if old_digest else None,
+                                       self.get_object(new_digest) if new_digest else None))
+        return changes
+
+
+def _changed_entries(old, new):
+    for name, digest in old.items():
+        if new.get(name) != digest:
+            yield name, digest, new.get(name)
+    for name, digest in new.items():
+        if name not in old:
+            yield name, None, digest
+
+
+def _change(source, name, change, key=None, old=None, new=None):
+    return {'Source': source, 'Name': name, 'Change': change, 'Key': key, 'Old': old, 'New': new}
+
+
+def _diff_mapping(source, name, label, old, new):
+    changes = []
+    for key, value in old.items():
+        if key not in new:
+            changes.append(_change(source, name, f'{label} removed', key, value, None))
+        elif new[key] != value:
+            changes.append(_change(source, name, f'{label} changed', key, value, new[key]))
+    for key, value in new.items():
+        if key not in old:
+            changes.append(_change(source, name, f'{label} added', key, None, value))
+    return changes
+
+
+def _diff_agent(name, old, new):
+    if old is None:
+        return [_change('agent', name, 'agent added', new=new['integration_year'])]
+    if new is None:
+        return [_change('agent', name, 'agent removed', old=old['integration_year'])]
+    changes = []
+    if old['integration_year'] != new['integration_year']:
+        changes.append(_change('agent', name, 'integration year changed', None,
+                               old['integration_year'], new['integration_year']))
+    for field in ('domain', 'description'):
+        if old[field] != new[field]:
+            changes.append(_change('agent', name, f'{field} changed', None, old[field], new[field]))
+    if old.get('sub_domain') != new.get('sub_domain'):
+        changes.append(_change('agent', name, 'sub-domain changed', None,
+                               old.get('sub_domain'), new.get('sub_domain')))
+    for field in ('adoption_model', 'adoption_params'):
+        default = DEFAULT_MODEL if field == 'adoption_model' else None
+        if old.get(field, default) != new.get(field, default):
+            changes.append(_change('agent', name, f"{field.replace('_', ' ')} changed", None,
+                                   old.get(field, default), new.get(field, default)))
+    changes.extend(_diff_mapping('agent', name, 'milestone',
+                                 old['yearly_milestones'], new['yearly_milestones']))
+    old_predictions = set(old['predictions'])
+    new_predictions = set(new['predictions'])
+    for prediction in old['predictions']:
+        if prediction not in new_predictions:
+            changes.append(_change('agent', name, 'prediction removed', old=prediction))
+    for prediction in new['predictions']:
+        if prediction not in old_predictions:
+            changes.append(_change('agent', name, 'prediction added', new=prediction))
+    return changes
+
+
+def _diff_phase(phase, old, new):
+    if old is None:
+        return [_change('blueprint', phase, 'phase added', new=len(new))]
+    if new is None:
+        return [_change('blueprint', phase, 'phase removed', old=len(old))]
+    return _diff_mapping('blueprint', phase, 'milestone', dict(old), dict(new))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and compare forecast snapshots")
+    parser.add_argument('--store', default=DEFAULT_STORE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    save = commands.add_parser('save', help="snapshot the current agents and blueprint")
+    save.add_argument('--label')
+    commands.add_parser('list', help="list recorded snapshots")
+    diff = commands.add_parser('diff', help="show changes between two snapshots")
+    diff.add_argument('old')
+    diff.add_argument('new')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    if args.command == 'save':
+        print(store.commit(get_all_agents(), label=args.label))
+    elif args.command == 'list':
+        for entry in store.log():
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+            print(f"{entry['version'][:12]}  {created}  {entry['label']}")
+    elif args.command == 'diff':
+        try:
+            changes = store.diff(args.old, args.new)
+        except KeyError as e:
+            parser.error(e.args[0])
+        for change in changes:
+            print(f"[{change['Source']}] {change['Name']}: {change['Change']}"
+                  f" {change['Key'] or ''} {change['Old']!r} -> {change['New']!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+import argparse
+import copy
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+from ai_agents import AIAgent, get_all_agents
+from session_memory import discard_session_objects, invalidate_shared, record_session, session_object, touch_session
+from timeline_data import START_YEAR
+
+# Events are JSON objects, one per line of an append-only file or submitted
+# to LiveFeed.submit:
+#   {"type": "milestone", "agent": "...", "year": 2029, "text": "..."}   text null removes it
+#   {"type": "prediction", "agent": "...", "text": "...", "remove": false}
+#   {"type": "integration_year", "agent": "...", "year": 2032}
+#   {"type": "agent", "agent": "...", "domain": "...", "sub_domain": "...", "description": "...",
+#    "integration_year": 2033}
+#
+# Each event changes one field of the agent set. Everything derived from the
+# agents declares the fields it reads, so a batch only rebuilds and redraws
+# what it actually touched. 'agents' (membership, domains, description) is
+# read by everything.
+FIELDS = ('agents', 'milestones', 'predictions', 'integration_year')
+EVENT_FIELDS = {
+    'agent': 'agents',
+    'milestone': 'milestones',
+    'prediction': 'predictions',
+    'integration_year': 'integration_year',
+}
+POLL_INTERVAL = 0.05  # Seconds between checks of the event file
+BATCH_INTERVAL = 0.1  # Events arriving within this window are applied together
+MAX_BATCH = 5000
+FOLLOW_TICK = 0.25  # How often a following session checks for a rerun or stop request
+LIVE_EVENTS_FILE = os.environ.get('LIVE_EVENTS_FILE')  # Set to make the dashboard follow this file
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+_dependents = {}  # versioned object name -> fields it reads
+
+
+class LiveSnapshot:
+    # An immutable view of the agent set after some number of batches
+    def __init__(self, version, agents, field_versions, applied=0, rejected=0, last_error=None):
+        self.version = version
+        self.agents = agents
+        self.field_versions = field_versions
+        self.applied = applied
+        self.rejected = rejected
+        self.last_error = last_error
+        self.updated = time.time()
+
+    def version_of(self, fields):
+        return max(self.field_versions[field] for field in ('agents',) + tuple(fields))
+
+    def changed_since(self, other):
+        return {field for field in FIELDS if self.field_versions[field] != other.field_versions[field]}
+
+
+def _integration_year(value):
+    # Progress curves run from START_YEAR to the integration year
+    year = int(value)
+    if year <= START_YEAR:
+        raise ValueError(f"Integration year must be after {START_YEAR}: {year}")
+    return year
+
+
+def apply_event(agents, index, event):
+    # Applies one event to the list in place. The event is applied to a new
+    # copy of the agent, which replaces the original only once every field
+    # has applied, so a rejected event leaves the list as it was and earlier
+    # snapshots keep their own objects.
+    kind = event.get('type')
+    name = event.get('agent')
+    if kind not in EVENT_FIELDS:
+        raise ValueError(f"Unknown event type: {kind}")
+    if not isinstance(name, str):
+        raise ValueError("Event is missing an agent name")
+    if kind == 'agent' and name not in index:
+        agent = AIAgent(name, event.get('domain', ''), event.get('description', ''))
+        agent.set_sub_domain(event.get('sub_domain'))
+        agent.set_integration_year(_integration_year(event['integration_year']))
+        index[name] = len(agents)
+        agents.append(agent)
+        return
+    if name not in index:
+        raise ValueError(f"Unknown agent: {name}")
+
+    agent = copy.copy(agents[index[name]])
+    if kind == 'milestone':
+        year = event.get('year')
+        if not isinstance(year, int):
+            raise ValueError(f"Milestone year must be an integer: {year!r}")
+        milestones = dict(agent.yearly_milestones)
+        if event.get('text') is None:
+            milestones.pop(year, None)
+        else:
+            milestones[year] = str(event['text'])
+        agent.set_yearly_milestones(milestones)
+    elif kind == 'prediction':
+        text = str(event['text'])
+        predictions = [prediction for prediction in agent.predictions if prediction != text]
+        if not event.get('remove'):
+            predictions.append(text)
+        agent.set_predictions(predictions)
+    elif kind == 'integration_year':
+        agent.set_integration_year(_integration_year(event['year']))
+    else:
+        for field in ('domain', 'description'):
+            if field in event:
+                setattr(agent, field, str(event[field]))
+        if 'sub_domain' in event:
+            agent.set_sub_domain(event['sub_domain'])
+        if 'integration_year' in event:
+            agent.set_integration_year(_integration_year(event['integration_year']))
+    agents[index[name]] = agent
+
+
+class EventFileTailer:
+    # Reads complete lines appended since the last read. A trailing partial
+    # line waits for its newline; a truncated or replaced file is read again
+    # from the start.
+    def __init__(self, path):
+        self.path = path
+        self._offset = 0
+        self._inode = None
+        self._partial = b''
+
+    def read(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode = stat.st_ino
+            self._offset = 0
+            self._partial = b''
+        if stat.st_size == self._offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(stat.st_size - self._offset)
+        self._offset += len(data)
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        return [line for line in lines if line.strip()]
+
+
+class LiveFeed:
+    # One background thread per process tails the event file and the submit
+    # queue, applies events in micro-batches to a copy of the agent set and
+    # publishes the result as a new snapshot. Sessions block in wait() until
+    # a snapshot newer than theirs is published.
+    def __init__(self, path=None, agents_factory=get_all_agents, batch_interval=BATCH_INTERVAL):
+        self.path = path
+        self.batch_interval = batch_interval
+        self._tailer = EventFileTailer(path) if path else None
+        self._queue = queue.SimpleQueue()
+        self._listeners = []
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._snapshot = LiveSnapshot(0, tuple(agents_factory()), dict.fromkeys(FIELDS, 0))
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='live-events', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, event):
+        self._queue.put(event)
+
+    def add_listener(self, callback):
+        # callback(snapshot, changed_fields) runs on the feed thread before
+        # waiting sessions are woken
+        self._listeners.append(callback)
+
+    def snapshot(self):
+        return self._snapshot
+
+    def wait(self, version, timeout=None):
+        with self._condition:
+            self._condition.wait_for(lambda: self._snapshot.version > version, timeout)
+            return self._snapshot
+
+    def _collect(self):
+        events = []
+        if self._tailer is not None:
+            events.extend(self._tailer.read())
+        while len(events) < MAX_BATCH:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self):
+        pending = []
+        first_pending = None
+        while not self._stopped.is_set():
+            events = self._collect()
+            if events:
+                pending.extend(events)
+                first_pending = first_pending or time.monotonic()
+            if pending and (time.monotonic() - first_pending >= self.batch_interval or len(pending) >= MAX_BATCH):
+                self.apply(pending)
+                pending = []
+                first_pending = None
+            self._stopped.wait(POLL_INTERVAL)
+
+    def apply(self, events):
+        old = self._snapshot
+        agents = list(old.agents)
+        index = {agent.name: i for i, agent in enumerate(agents)}
+        changed = set()
+        applied, rejected, last_error = old.applied, old.rejected, old.last_error
+        for event in events:
+            try:
+                if isinstance(event, bytes):
+                    event = json.loads(event)
+                apply_event(agents, index, event)
+                changed.add(EVENT_FIELDS[event['type']])
+                applied += 1
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                rejected += 1
+                last_error = str(e)
+        if not changed:
+            if rejected != old.rejected:
+                self._publish(LiveSnapshot(old.version, old.agents, old.field_versions,
+                                           applied, rejected, last_error), changed)
+            return self._snapshot
+        version = old.version + 1
+        field_versions = {field: version if field in changed else old.field_versions[field] for field in FIELDS}
+        snapshot = LiveSnapshot(version, tuple(agents), field_versions, applied, rejected, last_error)
+        self._publish(snapshot, changed)
+        return snapshot
+
+    def _publish(self, snapshot, changed):
+        self._snapshot = snapshot
+        if changed:
+            invalidate_dependents(changed)
+            for callback in self._listeners:
+                callback(snapshot, changed)
+        with self._condition:
+            self._condition.notify_all()
+
+
+def get_feed(path, agents_factory=get_all_agents):
+    # The feed for an event file is shared by every session in the process
+    path = os.path.abspath(path)
+    with _feeds_lock:
+        feed = _feeds.get(path)
+        if feed is None:
+            feed = _feeds[path] = LiveFeed(path, agents_factory).start()
+    return feed
+
+
+def versioned_name(snapshot, name, fields):
+    # Objects built from a snapshot are keyed by the last version that changed
+    # what they read, so unaffected objects keep their key across batches
+    if snapshot is None:
+        return name
+    _dependents[name] = tuple(fields)
+    return f"{name}@{snapshot.version_of(fields)}"
+
+
+def _yield_to_streamlit():
+    # Streamlit stops or restarts a running script only from inside its own
+    # API calls. Every session_state access first runs the script runner's
+    # yield callback, which raises the rerun or stop exception when a widget
+    # changed, the session disconnected or the server is shutting down. The
+    # key is never set; the lookup exists only for that side effect.
+    import streamlit as st
+    return '_live_follow_yield' in st.session_state
+
+
+def invalidate_dependents(changed):
+    # Drops shared objects built from earlier versions of the changed fields
+    for name, fields in list(_dependents.items()):
+        if 'agents' in changed or changed.intersection(fields):
+            invalidate_shared(f"{name}@")
+
+
+class LiveCharts:
+    # Charts drawn through chart() keep their placeholder. In live mode,
+    # follow() then redraws just the charts whose fields a batch changed,
+    # so only those elements are sent to the browser.
+    def __init__(self, feed=None, agents_loader=get_all_agents):
+        self.feed = feed
+        self.snapshot = feed.snapshot() if feed else None
+        self._agents_loader = agents_loader
+        self._charts = []
+
+    @property
+    def agents(self):
+        return list(self.snapshot.agents) if self.snapshot else self._agents_loader()
+
+    def key(self, name, fields=FIELDS):
+        return versioned_name(self.snapshot, name, fields)
+
+    def chart(self, fields, draw):
+        # draw(container) renders into the placeholder using self.key() names
+        import streamlit as st
+        placeholder = st.empty()
+        self._charts.append((tuple(fields), placeholder, draw))
+        draw(placeholder.container())
+
+    def figure(self, name, fields, build):
+        # A figure shared between sessions, built by build(agents)
+        def draw(container):
+            fig = session_object(self.key(name, fields), 'figures', lambda: build(self.agents))
+            container.plotly_chart(fig, use_container_width=True, theme="streamlit")
+        self.chart(fields, draw)
+
+    def follow(self, status=None):
+        # Never returns: redraws until Streamlit ends the script run through
+        # _yield_to_streamlit, so it must be the last call of the script
+        while True:
+            _yield_to_streamlit()
+            touch_session()
+            snapshot = self.feed.wait(self.snapshot.version, FOLLOW_TICK)
+            if snapshot.version == self.snapshot.version:
+                continue
+            changed = snapshot.changed_since(self.snapshot)
+            self.snapshot = snapshot
+            for name, fields in list(_dependents.items()):
+                if 'agents' in changed or changed.intersection(fields):
+                    discard_session_objects(f"{name}@")
+            for fields, placeholder, draw in self._charts:
+                if 'agents' in changed or changed.intersection(fields):
+                    draw(placeholder.container())
+            if status is not None:
+                status(snapshot)
+            record_session()  # Redrawn charts may have built new objects
+
+
+def live_status(snapshot):
+    updated = datetime.datetime.fromtimestamp(snapshot.updated).strftime('%H:%M:%S')
+    status = f"🔴 Live: {snapshot.applied} events applied, last update {updated}"
+    if snapshot.rejected:
+        status += f" ({snapshot.rejected} rejected; last error: {snapshot.last_error})"
+    return status
+
+
+def default_feed():
+    return get_feed(LIVE_EVENTS_FILE) if LIVE_EVENTS_FILE else None
+
+
+def append_events(path, events):
+    # Appends whole lines in one write so a concurrent reader never sees half an event
+    data = ''.join(json.dumps(event) + '\n' for event in events).encode('utf-8')
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append milestone and prediction events for live dashboards")
+    parser.add_argument('path', help="append-only event file (LIVE_EVENTS_FILE)")
+    parser.add_argument('events', nargs='+', help="JSON event objects")
+    args = parser.parse_args()
+    append_events(args.path, [json.loads(event) for event in args.events])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import sys
+import tempfile
+import time
+from importlib import metadata
+
+from ai_agents import get_all_agents
+from forecast_snapshots import SnapshotStore
+from session_memory import rss_bytes
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+PACKAGES = ['streamlit', 'pandas', 'plotly', 'numpy']
+POLL_INTERVAL = 1.0  # Seconds between checks that a level's process is still alive
+
+# Tabs are rendered on every run and switched client-side, so the actions
+# that reach the server are reruns with changed session state or widgets.
+ACTIONS = ['rerun', 'investment_level', 'public_trust', 'zoom', 'domain', 'snapshot']
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        'p50': pick(0.50),
+        'p90': pick(0.90),
+        'p99': pick(0.99),
+        'max': ordered[-1],
+        'mean': sum(ordered) / len(ordered),
+    }
+
+
+def apply_action(at, action, rng):
+    if action == 'investment_level':
+        at.session_state['investment_level'] = round(rng.uniform(0.5, 2.0), 2)
+    elif action == 'public_trust':
+        at.session_state['public_trust'] = round(rng.uniform(0.5, 2.0), 2)
+    elif action == 'zoom' and at.slider:
+        slider = at.slider[0]
+        start = rng.uniform(slider.min, slider.max - 1)
+        slider.set_range(round(start, 2), round(rng.uniform(start + 0.5, slider.max), 2))
+    elif action in ('domain', 'snapshot'):
+        prefix = 'Domain' if action == 'domain' else 'Compare'
+        for selectbox in at.selectbox:
+            if selectbox.label.startswith(prefix):
+                selectbox.set_value(rng.choice(selectbox.options))
+                break
+
+
+def run_level(sessions, rounds, seed, timeout):
+    # One process per level: every session shares this interpreter the way
+    # viewers share a single Streamlit server process.
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 1000003 + sessions)
+    # A throwaway run pays for module imports so the baseline holds only the
+    # shared process cost and the remainder is attributable to sessions.
+    AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    gc.collect()
+    baseline_rss = rss_bytes()
+    apps = [AppTest.from_file(APP_PATH, default_timeout=timeout) for _ in range(sessions)]
+
+    service = []
+    latency = []
+    cpu = []
+    errors = 0
+    for round_index in range(rounds + 1):
+        # All sessions act at the same instant; the runs are served one at a
+        # time, so a session's latency includes the runs queued before it.
+        round_start = time.perf_counter()
+        for at in apps:
+            if round_index:
+                apply_action(at, rng.choice(ACTIONS), rng)
+            cpu_start = time.process_time()
+            run_start = time.perf_counter()
+            at.run()
+            run_end = time.perf_counter()
+            errors += len(at.exception)
+            if round_index:  # The first round is the initial page load
+                service.append((run_end - run_start) * 1000)
+                latency.append((run_end - round_start) * 1000)
+                cpu.append((time.process_time() - cpu_start) * 1000)
+
+    final_rss = rss_bytes()
+    return {
+        'sessions': sessions,
+        'reruns': len(service),
+        'errors': errors,
+        'service_ms': percentiles(service),
+        'latency_ms': percentiles(latency),
+        'cpu_ms_per_rerun': percentiles(cpu),
+        'rss_mb_baseline': baseline_rss / 2 ** 20,
+        'rss_mb': final_rss / 2 ** 20,
+        'mb_per_session': (final_rss - baseline_rss) / 2 ** 20 / sessions,
+    }
+
+
+def _level_worker(args, results):
+    results.put(run_level(*args))
+
+
+def run_isolated(sessions, rounds, seed, timeout):
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    process = ctx.Process(target=_level_worker, args=((sessions, rounds, seed, timeout), results))
+    process.start()
+    result = None
+    while result is None and process.is_alive():
+        try:
+            result = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    if result is None:
+        # The process may have put its result just before exiting
+        try:
+            result = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            process.join()
+            raise RuntimeError(f"Level with {sessions} session(s) failed: "
+                               f"worker exited with code {process.exitcode}") from None
+    process.join()
+    return result
+
+
+def seed_snapshots(snapshot_dir):
+    # Earlier forecasts to compare against, so the snapshot selector is
+    # shown and the 'snapshot' action loads and overlays real versions
+    store = SnapshotStore(snapshot_dir)
+    for shift in (-1, 1):
+        agents = get_all_agents()
+        for agent in agents:
+            agent.set_integration_year(agent.integration_year + shift)
+        store.commit(agents, label=f"load-test {shift:+d} year")
+
+
+def environment():
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': versions,
+    }
+
+
+def print_report(report, baseline=None):
+    previous = {level['sessions']: level for level in (baseline or {}).get('levels', [])}
+    print(f"{'sessions':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'latency p99':>12}"
+          f" {'cpu ms':>8} {'MB/session':>11} {'errors':>7}")
+    for level in report['levels']:
+        line = (f"{level['sessions']:>8} {level['service_ms']['p50']:>9.1f}"
+                f" {level['service_ms']['p90']:>9.1f} {level['service_ms']['p99']:>9.1f}"
+                f" {level['latency_ms']['p99']:>12.1f} {level['cpu_ms_per_rerun']['mean']:>8.1f}"
+                f" {level['mb_per_session']:>11.2f} {level['errors']:>7}")
+        before = previous.get(level['sessions'])
+        if before:
+            change = level['service_ms']['p50'] / before['service_ms']['p50'] - 1
+            line += f"  p50 {change:+.1%} vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive simulated dashboard sessions headlessly and report rerun costs")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="concurrent session counts to measure")
+    parser.add_argument('--rounds', type=int, default=5, help="actions per session after the initial load")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=120, help="seconds allowed per app run")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--baseline', help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        # Keep simulated sessions from recording snapshots into the real store
+        os.environ['FORECAST_SNAPSHOT_DIR'] = snapshot_dir
+        # A live dashboard never finishes its run, so sessions would wait out the timeout
+        os.environ.pop('LIVE_EVENTS_FILE', None)
+        seed_snapshots(snapshot_dir)
+        levels = []
+        for sessions in args.sessions:
+            print(f"Running {sessions} session(s)...", file=sys.stderr)
+            levels.append(run_isolated(sessions, args.rounds, args.seed, args.timeout))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'sessions': args.sessions, 'rounds': args.rounds, 'seed': args.seed},
+        'environment': environment(),
+        'levels': levels,
+    }
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
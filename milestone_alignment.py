@@ -0,0 +1,198 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ai_agents import get_blueprint_phases, quarter_to_year
+
+TOKEN = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+    'is', 'of', 'on', 'or', 'the', 'to', 'with', 'first', 'full', 'fully',
+])
+MAX_DOCUMENT_FREQUENCY = 0.5  # Terms in more milestones than this carry no signal
+TEXT_WEIGHT = 0.7
+TIME_SCALE = 2.0  # Years over which time proximity decays by a factor of e
+CHUNK_SIZE = 2048
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def tfidf_matrices(left_texts, right_texts):
+    # One vocabulary and IDF over both corpora so the two row spaces line up
+    vocabulary = {}
+    rows = []
+    columns = []
+    texts = list(left_texts) + list(right_texts)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            columns.append(vocabulary.setdefault(token, len(vocabulary)))
+            rows.append(row)
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64))),
+        shape=(len(texts), max(len(vocabulary), 1))
+    )
+    counts.sum_duplicates()
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    if len(texts) > 2:
+        idf[document_frequency > MAX_DOCUMENT_FREQUENCY * len(texts)] = 0
+    weights = counts.multiply(idf.astype(np.float32)[None, :]).tocsr()
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    weights = sparse.diags((1 / norms).astype(np.float32)) @ weights
+    split = len(left_texts)
+    return weights[:split].tocsr(), weights[split:].tocsr()
+
+
+def _digest(*arrays):
+    h = hashlib.sha256()
+    for array in arrays:
+        for item in array:
+            h.update(str(item).encode('utf-8'))
+            h.update(b'\x00')
+        h.update(b'\x01')
+    return h.hexdigest()
+
+
+def align_milestones(left_texts, left_years, right_texts, right_years, k=3,
+                     text_weight=TEXT_WEIGHT, time_scale=TIME_SCALE, chunk_size=CHUNK_SIZE):
+    # Returns the k best right-hand matches for every left-hand milestone as
+    # (indices, scores, text similarities), each of shape (len(left), k).
+    #
+    # A pair with no shared terms scores on time proximity alone, so it can
+    # only make a row's top k if it is among the k nearest right-hand years.
+    # Scoring just the nonzero entries of the sparse similarity product plus
+    # those nearest-year neighbours is therefore exact, and keeps the work
+    # proportional to the number of pairs that share terms.
+    key = _digest(left_texts, left_years, right_texts, right_years,
+                  [k, text_weight, time_scale])
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    n_left = len(left_texts)
+    n_right = len(right_texts)
+    k = min(k, n_right)
+    indices = np.zeros((n_left, k), dtype=np.int64)
+    scores = np.zeros((n_left, k), dtype=np.float32)
+    similarities = np.zeros((n_left, k), dtype=np.float32)
+    if n_left and k:
+        left, right = tfidf_matrices(left_texts, right_texts)
+        right_t = right.T.tocsc()
+        left_years = np.asarray(left_years, dtype=np.float64)
+        right_years = np.asarray(right_years, dtype=np.float64)
+        by_year = np.argsort(right_years, kind='stable')
+        sorted_years = right_years[by_year]
+        window = np.arange(-k, k)
+
+        for start in range(0, n_left, chunk_size):
+            stop = min(start + chunk_size, n_left)
+            rows = stop - start
+            years = left_years[start:stop]
+            similarity = (left[start:stop] @ right_t).tocoo()
+
+            # The k nearest years always lie within k places of the insertion point
+            nearest = np.clip(np.searchsorted(sorted_years, years)[:, None] + window, 0, n_right - 1)
+            candidates = sparse.csr_matrix(
+                (np.concatenate([similarity.data, np.zeros(nearest.size, dtype=np.float32)]),
+                 (np.concatenate([similarity.row, np.repeat(np.arange(rows), nearest.shape[1])]),
+                  np.concatenate([similarity.col, by_year[nearest.ravel()]]))),
+                shape=(rows, n_right)
+            )
+
+            lengths = np.diff(candidates.indptr)
+            entry_rows = np.repeat(np.arange(rows), lengths)
+            entry_slots = np.arange(candidates.nnz) - candidates.indptr[entry_rows]
+            columns = candidates.indices
+            entry_scores = (text_weight * candidates.data +
+                            (1 - text_weight) * np.exp(-np.abs(years[entry_rows] - right_years[columns]) / time_scale))
+
+            # Pad each row's candidates into a small dense block for partial sorting
+            width = lengths.max()
+            padded_scores = np.full((rows, width), -np.inf, dtype=np.float32)
+            padded_columns = np.zeros((rows, width), dtype=np.int64)
+            padded_similarity = np.zeros((rows, width), dtype=np.float32)
+            padded_scores[entry_rows, entry_slots] = entry_scores
+            padded_columns[entry_rows, entry_slots] = columns
+            padded_similarity[entry_rows, entry_slots] = candidates.data
+
+            if k < width:
+                top = np.argpartition(-padded_scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(width), (rows, width))
+            top_scores = np.take_along_axis(padded_scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            indices[start:stop] = np.take_along_axis(padded_columns, top, axis=1)
+            scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+            similarities[start:stop] = np.take_along_axis(padded_similarity, top, axis=1)
+
+    result = (indices, scores, similarities)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def blueprint_milestones(phases=None):
+    if phases is None:
+        phases = get_blueprint_phases()
+    return [
+        {'Phase': phase, 'Date': date, 'Milestone': milestone, 'Year': quarter_to_year(date)}
+        for phase, milestones in phases.items()
+        for date, milestone in milestones
+    ]
+
+
+def align_agents_to_blueprint(agents, phases=None, k=1):
+    agent_rows = [
+        {'Agent': agent.name, 'Domain': agent.domain, 'Year': year, 'Milestone': milestone}
+        for agent in agents
+        for year, milestone in agent.yearly_milestones.items()
+    ]
+    blueprint_rows = blueprint_milestones(phases)
+    indices, scores, similarities = align_milestones(
+        [row['Milestone'] for row in agent_rows], [row['Year'] for row in agent_rows],
+        [row['Milestone'] for row in blueprint_rows], [row['Year'] for row in blueprint_rows],
+        k=k
+    )
+
+    blueprint = pd.DataFrame(blueprint_rows)
+    # Explicit columns keep the frame well-formed when no agent has milestones
+    matches = pd.DataFrame(agent_rows, columns=['Agent', 'Domain', 'Year', 'Milestone']).loc[np.repeat(np.arange(len(agent_rows)), indices.shape[1])]
+    matched = blueprint.iloc[indices.ravel()].reset_index(drop=True)
+    matches = matches.reset_index(drop=True)
+    matches['Rank'] = np.tile(np.arange(1, indices.shape[1] + 1), len(agent_rows))
+    matches['Blueprint Phase'] = matched['Phase']
+    matches['Blueprint Date'] = matched['Date']
+    matches['Blueprint Milestone'] = matched['Milestone']
+    matches['Text Similarity'] = similarities.ravel()
+    matches['Score'] = scores.ravel()
+    # Positive deltas: the agent expects the milestone later than the blueprint
+    matches['Delta Years'] = matches['Year'] - matched['Year']
+    return matches
+
+
+def schedule_deltas(matches):
+    best = matches[matches['Rank'] == 1]
+    return best.groupby('Domain', sort=False).agg(
+        Milestones=('Milestone', 'size'),
+        **{
+            'Mean Delta Years': ('Delta Years', 'mean'),
+            'Median Delta Years': ('Delta Years', 'median'),
+            'Mean Text Similarity': ('Text Similarity', 'mean'),
+        }
+    ).reset_index()
@@ -0,0 +1,279 @@
+import heapq
+from collections import deque
+
+from ai_agents import get_blueprint_phases, quarter_to_year
+
+EPSILON = 1e-9
+
+# Explicit cross-domain edges: (prerequisite, dependent)
+DEFAULT_DEPENDENCIES = [
+    ("Phase 1: Foundation/2025 Q3", "Regulation and Ethics Agent/2026"),
+    ("Regulation and Ethics Agent/2027", "Phase 1: Foundation/2027 Q2"),
+    ("Infrastructure Development Agent/2025", "Vision and Purpose Agent/2026"),
+    ("Infrastructure Development Agent/2028", "Phase 2: Acceleration/2028 Q4"),
+    ("Phase 1: Foundation/2025 Q4", "Infrastructure Development Agent/2028"),
+    ("Economic Development Agent/2027", "Phase 2: Acceleration/2027 Q3"),
+    ("National Security Agent/2027", "Global Collaboration Agent/2027"),
+    ("Global Collaboration Agent/2030", "Phase 3: Maturation/2032 Q1"),
+    ("Regulation and Ethics Agent/2030", "Phase 3: Maturation/2032 Q1"),
+    ("Transparency and Public Trust Agent/2029", "Phase 3: Maturation/2033 Q2"),
+    ("Phase 1: Foundation/2026 Q1", "Vision and Purpose Agent/2029"),
+    ("Infrastructure Development Agent/2030", "Phase 3: Maturation/2034 Q1"),
+]
+
+
+class MilestoneGraph:
+    def __init__(self):
+        self._index = {}
+        self.ids = []
+        self.labels = []
+        self.release = []
+        self.duration = []
+        self.successors = []
+        self.predecessors = []
+
+        self._order = None
+        self._position = None
+        self.earliest_start = None
+        self._tail = None
+        self.project_end = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node_id):
+        return node_id in self._index
+
+    def add_milestone(self, node_id, year, duration=0.0, label=None):
+        if node_id in self._index:
+            raise ValueError(f"Duplicate milestone: {node_id}")
+        self._index[node_id] = len(self.ids)
+        self.ids.append(node_id)
+        self.labels.append(label or node_id)
+        self.release.append(float(year))
+        self.duration.append(float(duration))
+        self.successors.append([])
+        self.predecessors.append([])
+        self._invalidate()
+
+    def add_dependency(self, before, after, lag=0.0):
+        u = self._lookup(before)
+        v = self._lookup(after)
+        if u == v:
+            raise ValueError(f"Milestone cannot depend on itself: {before}")
+        self.successors[u].append((v, float(lag)))
+        self.predecessors[v].append((u, float(lag)))
+        self._invalidate()
+
+    def _lookup(self, node_id):
+        try:
+            return self._index[node_id]
+        except KeyError:
+            raise KeyError(f"Unknown milestone: {node_id}") from None
+
+    def _invalidate(self):
+        self._order = None
+        self.earliest_start = None
+
+    def topological_order(self):
+        if self._order is None:
+            self._order = self._kahn()
+            self._position = [0] * len(self.ids)
+            for pos, v in enumerate(self._order):
+                self._position[v] = pos
+        return [self.ids[v] for v in self._order]
+
+    def _kahn(self):
+        in_degree = [len(preds) for preds in self.predecessors]
+        queue = deque(v for v, d in enumerate(in_degree) if d == 0)
+        order = []
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for v, _ in self.successors[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+        if len(order) != len(self.ids):
+            cycle = self._find_cycle({v for v, d in enumerate(in_degree) if d > 0})
+            raise ValueError("Milestone dependencies contain a cycle: " +
+                             " -> ".join(self.ids[v] for v in cycle))
+        return order
+
+    def _find_cycle(self, remaining):
+        # Every node left over by Kahn's algorithm has a predecessor that is
+        # also left over, so walking predecessors must eventually repeat.
+        v = next(iter(remaining))
+        seen = {}
+        path = []
+        while v not in seen:
+            seen[v] = len(path)
+            path.append(v)
+            v = next(u for u, _ in self.predecessors[v] if u in remaining)
+        cycle = path[seen[v]:] + [v]
+        return cycle[::-1]
+
+    def schedule(self):
+        self.topological_order()
+        order = self._order
+        n = len(self.ids)
+
+        # Forward pass: earliest start honours both release year and prerequisites
+        es = self.release[:]
+        for u in order:
+            finish = es[u] + self.duration[u]
+            for v, lag in self.successors[u]:
+                if finish + lag > es[v]:
+                    es[v] = finish + lag
+
+        # Backward pass: longest remaining chain (including own duration) to
+        # the end of the plan. Latest start is then project_end - tail.
+        tail = self.duration[:]
+        for u in reversed(order):
+            best = 0.0
+            for v, lag in self.successors[u]:
+                if lag + tail[v] > best:
+                    best = lag + tail[v]
+            tail[u] = self.duration[u] + best
+
+        self.earliest_start = es
+        self._tail = tail
+        self.project_end = max((es[v] + self.duration[v] for v in range(n)), default=0.0)
+        return self
+
+    def _ensure_scheduled(self):
+        if self.earliest_start is None:
+            self.schedule()
+
+    def earliest_finish(self, node_id):
+        self._ensure_scheduled()
+        v = self._lookup(node_id)
+        return self.earliest_start[v] + self.duration[v]
+
+    def latest_start(self, node_id):
+        self._ensure_scheduled()
+        return self.project_end - self._tail[self._lookup(node_id)]
+
+    def slack(self, node_id):
+        self._ensure_scheduled()
+        v = self._lookup(node_id)
+        return self.project_end - self._tail[v] - self.earliest_start[v]
+
+    def critical_path(self):
+        self._ensure_scheduled()
+        es = self.earliest_start
+        ends = [v for v in range(len(self.ids))
+                if abs(es[v] + self.duration[v] - self.project_end) < EPSILON]
+        if not ends:
+            return []
+        # Walk back along the prerequisites that actually drive each start date
+        v = min(ends, key=lambda x: self._position[x])
+        path = [v]
+        while True:
+            driver = None
+            for u, lag in self.predecessors[v]:
+                if abs(es[u] + self.duration[u] + lag - es[v]) < EPSILON:
+                    driver = u
+                    break
+            if driver is None:
+                break
+            path.append(driver)
+            v = driver
+        return [self.ids[v] for v in reversed(path)]
+
+    def move_milestone(self, node_id, year):
+        # Re-propagate earliest starts only through the affected descendants,
+        # visiting them in topological order so each is settled once.
+        self._ensure_scheduled()
+        start = self._lookup(node_id)
+        self.release[start] = float(year)
+
+        es = self.earliest_start
+        old_end = self.project_end
+        end_touched = False
+        changed = []
+        heap = [(self._position[start], start)]
+        queued = {start}
+        while heap:
+            _, v = heapq.heappop(heap)
+            new_es = self.release[v]
+            for u, lag in self.predecessors[v]:
+                candidate = es[u] + self.duration[u] + lag
+                if candidate > new_es:
+                    new_es = candidate
+            if abs(new_es - es[v]) < EPSILON:
+                continue
+            if abs(es[v] + self.duration[v] - old_end) < EPSILON:
+                end_touched = True
+            es[v] = new_es
+            changed.append(v)
+            for w, _ in self.successors[v]:
+                if w not in queued:
+                    queued.add(w)
+                    heapq.heappush(heap, (self._position[w], w))
+
+        new_end = max((es[v] + self.duration[v] for v in changed), default=old_end)
+        if new_end > old_end:
+            self.project_end = new_end
+        elif end_touched:
+            self.project_end = max(es[v] + self.duration[v] for v in range(len(self.ids)))
+        return [self.ids[v] for v in changed]
+
+    def to_records(self):
+        self._ensure_scheduled()
+        records = []
+        for v in self._order:
+            es = self.earliest_start[v]
+            ls = self.project_end - self._tail[v]
+            records.append({
+                'Milestone': self.ids[v],
+                'Label': self.labels[v],
+                'Planned': self.release[v],
+                'Earliest Start': es,
+                'Latest Start': ls,
+                'Slack': ls - es,
+                'Critical': ls - es < EPSILON,
+            })
+        return records
+
+
+def agent_milestone_id(agent, year):
+    return f"{agent.name}/{year}"
+
+
+def blueprint_milestone_id(phase, date):
+    return f"{phase}/{date}"
+
+
+def build_milestone_graph(agents, phases=None, dependencies=DEFAULT_DEPENDENCIES):
+    if phases is None:
+        phases = get_blueprint_phases()
+    graph = MilestoneGraph()
+
+    # Each agent's milestones and each blueprint phase form a chronological chain
+    for agent in agents:
+        previous = None
+        for year in sorted(agent.yearly_milestones):
+            node_id = agent_milestone_id(agent, year)
+            graph.add_milestone(node_id, year, duration=1.0,
+                                label=agent.yearly_milestones[year])
+            if previous is not None:
+                graph.add_dependency(previous, node_id)
+            previous = node_id
+
+    previous = None
+    for phase, milestones in phases.items():
+        for date, milestone in sorted(milestones, key=lambda m: quarter_to_year(m[0])):
+            node_id = blueprint_milestone_id(phase, date)
+            graph.add_milestone(node_id, quarter_to_year(date), duration=0.25,
+                                label=milestone)
+            if previous is not None:
+                graph.add_dependency(previous, node_id)
+            previous = node_id
+
+    for before, after in dependencies:
+        # Dependencies may reference agents that are not part of this set
+        if before in graph and after in graph:
+            graph.add_dependency(before, after)
+
+    return graph.schedule()
@@ -0,0 +1,143 @@
+import os
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+PredictionTarget = namedtuple('PredictionTarget', ['text', 'year', 'metric', 'percent'])
+
+# Patterns are compiled once at import. The target year prefers one
+# introduced by "by/in/before 20XX" and falls back to the last year mentioned.
+_YEAR = re.compile(r'((?:19|20)\d\d)(?!\d)')
+_CLAUSE_WORDS = frozenset(['by', 'in', 'before', 'until', 'around'])
+_PERCENT = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_VERB = re.compile(
+    r'\s+(?:reach(?:es)?|achieves?|surpass(?:es)?|exceeds?|hits?|becomes?|'
+    r'comprises?|contributes?\s+to|uses?|creates?|adopted\s+by|launch(?:es)?|'
+    r'emerges?|leads?\s+to|formed|established|deployed|(?:fully\s+)?operational|complete)\b',
+    re.IGNORECASE
+)
+_PERCENT_SUBJECT = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*%\s+of\s+(.*)$', re.IGNORECASE)
+
+CACHE_SIZE = 1 << 21
+PARALLEL_THRESHOLD = 200_000
+CHUNK_SIZE = 50_000
+
+_cache = {}
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def _parse(text):
+    year = None
+    body = text
+    for match in _YEAR.finditer(text):
+        start = match.start()
+        if start and text[start - 1].isdigit():
+            continue
+        year = int(match.group(1))
+        # Only the word right before the year can make it a "by 20XX" clause
+        before = text[max(0, start - 8):start]
+        if before[-1:] == ' ':
+            words = before.split()
+            if words and words[-1].lower() in _CLAUSE_WORDS:
+                # A leading clause ("By 2030, ...") leaves its punctuation behind
+                body = (text[:start - len(before) + before.rindex(words[-1])].rstrip() +
+                        text[match.end():]).lstrip(' ,;:')
+                break
+
+    percent = None
+    sign = body.find('%')
+    if sign != -1:
+        match = _PERCENT.search(body, max(0, sign - 16))
+        if match:
+            percent = float(match.group(1))
+            # "50% of US manufacturing uses ..." puts the metric after the percentage
+            leading = _PERCENT_SUBJECT.match(body)
+            if leading:
+                body = leading.group(2)
+
+    verb = _VERB.search(body)
+    metric = (body[:verb.start()] if verb else body).strip(' .,;')
+    return PredictionTarget(text, year, metric, percent)
+
+
+def _parse_chunk(texts):
+    return [_parse(text)[1:] for text in texts]
+
+
+def parse_prediction(text):
+    target = _cache.get(text)
+    if target is None:
+        if len(_cache) >= CACHE_SIZE:
+            _cache.clear()
+        target = _cache[text] = _parse(text)
+    return target
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS or Windows
+        return os.cpu_count() or 1
+
+
+def _get_pool(workers):
+    # One pool per process, kept between calls; worker start-up costs more
+    # than parsing a chunk
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(workers)
+            _pool_workers = workers
+        return _pool
+
+
+def extract_targets(predictions, processes=None):
+    # Each distinct text is parsed once; large batches of unseen texts are
+    # split across worker processes when there is more than one CPU to use.
+    predictions = list(predictions)
+    missing = [text for text in dict.fromkeys(predictions) if text not in _cache]
+    workers = processes or available_cpus()
+    if len(missing) >= PARALLEL_THRESHOLD and workers > 1:
+        if len(_cache) + len(missing) > CACHE_SIZE:
+            _cache.clear()
+        chunks = [missing[i:i + CHUNK_SIZE] for i in range(0, len(missing), CHUNK_SIZE)]
+        for chunk, results in zip(chunks, _get_pool(workers).map(_parse_chunk, chunks)):
+            for text, fields in zip(chunk, results):
+                _cache[text] = PredictionTarget(text, *fields)
+    return [parse_prediction(text) for text in predictions]
+
+
+def prediction_events(agents):
+    # Dated predictions as timeline events next to each agent's yearly milestones
+    events = []
+    for agent in agents:
+        for year, milestone in agent.yearly_milestones.items():
+            events.append({
+                'Agent': agent.name,
+                'Year': year,
+                'Type': 'Milestone',
+                'Event': milestone,
+                'Metric': None,
+                'Percent': None,
+            })
+        for target in extract_targets(agent.predictions):
+            if target.year is None:
+                continue
+            events.append({
+                'Agent': agent.name,
+                'Year': target.year,
+                'Type': 'Prediction',
+                'Event': target.text,
+                'Metric': target.metric,
+                'Percent': target.percent,
+            })
+    return events
@@ -0,0 +1,195 @@
+import numpy as np
+
+from timeline_data import END_YEAR, START_YEAR, TIME_LEVELS, domain_label, integration_progress
+
+# Group levels from coarsest to finest. A key is a tuple with one entry per
+# level down to its own: (domain,), (domain, sub_domain) or
+# (domain, sub_domain, agent name), so rolling up is dropping the last entry.
+HIERARCHY = ('domain', 'sub_domain', 'agent')
+RELATIONSHIP_WINDOW = 1  # Milestones within this many years of each other are related
+
+
+def sub_domain_of(agent):
+    return agent.sub_domain or agent.domain
+
+
+def _groups(codes):
+    # Row order that makes each group contiguous, and where each group starts
+    order = np.argsort(codes, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+    return order, starts
+
+
+class RollupCube:
+    # Milestone counts and adoption progress for every (domain, sub-domain,
+    # agent, time bin) cell, plus integration-year statistics. Everything is
+    # aggregated up the group hierarchy and across time levels once, at build
+    # time; queries only look up precomputed rows, so drilling down or rolling
+    # up never rescans the agents.
+    #
+    # Counts are summed within a time bin. Progress is averaged over the months
+    # of each bin, then across the agents of a group (with min/max). Monthly
+    # bins are the exact samples, so point values at the start of any bin are
+    # a strided view of the month level.
+    def __init__(self, agents, start=START_YEAR, end=END_YEAR):
+        self.start = start
+        months = (end - start + 1) * 12
+        n = len(agents)
+
+        agent_keys = [(agent.domain, sub_domain_of(agent), agent.name) for agent in agents]
+        sub_keys = sorted({key[:2] for key in agent_keys})
+        domain_keys = sorted({key[:1] for key in agent_keys})
+        self.keys = {'domain': domain_keys, 'sub_domain': sub_keys, 'agent': agent_keys}
+        self.index = {level: {key: row for row, key in enumerate(keys)} for level, keys in self.keys.items()}
+        self.labels = {
+            'domain': [key[0] for key in domain_keys],
+            'sub_domain': [key[1] for key in sub_keys],
+            'agent': [domain_label(agent) for agent in agents],
+        }
+        self.descriptions = [agent.description for agent in agents]
+
+        # Row of each agent in every level, and the members under every key
+        codes = {
+            'agent': np.arange(n),
+            'sub_domain': np.array([self.index['sub_domain'][key[:2]] for key in agent_keys], dtype=np.int64),
+            'domain': np.array([self.index['domain'][key[:1]] for key in agent_keys], dtype=np.int64),
+        }
+        self._members = {level: {None: np.arange(len(self.keys[level]))} for level in HIERARCHY}
+        for depth, level in enumerate(HIERARCHY):
+            for ancestor_depth in range(1, depth + 1):
+                grouped = {}
+                for row, key in enumerate(self.keys[level]):
+                    grouped.setdefault(key[:ancestor_depth], []).append(row)
+                self._members[level].update({key: np.array(rows, dtype=np.int64) for key, rows in grouped.items()})
+
+        # Agent-level cells at month resolution
+        progress = integration_progress(agents, start + np.arange(months) / 12)
+        counts = np.zeros((n, months), dtype=np.int64)
+        cells = [(row, (year - start) * 12) for row, agent in enumerate(agents)
+                 for year in agent.yearly_milestones if start <= year <= end]
+        if cells:
+            rows, columns = np.array(cells).T
+            np.add.at(counts, (rows, columns), 1)
+        integration_years = np.array([agent.integration_year for agent in agents], dtype=float)
+
+        self.x = {}
+        self.counts = {level: {} for level in HIERARCHY}
+        self.progress_mean = {level: {} for level in HIERARCHY}
+        self.progress_min = {level: {} for level in HIERARCHY}
+        self.progress_max = {level: {} for level in HIERARCHY}
+        for time, months_per_bin in TIME_LEVELS:
+            bins = months // months_per_bin
+            self.x[time] = start + np.arange(0, months, months_per_bin) / 12
+            self.counts['agent'][time] = counts.reshape(n, bins, months_per_bin).sum(axis=2)
+            means = progress.reshape(n, bins, months_per_bin).mean(axis=2)
+            self.progress_mean['agent'][time] = means
+            self.progress_min['agent'][time] = means
+            self.progress_max['agent'][time] = means
+
+        self.agent_counts = {'agent': np.ones(n, dtype=np.int64)}
+        self.integration = {'agent': {
+            'mean': integration_years, 'median': integration_years,
+            'min': integration_years, 'max': integration_years, 'std': np.zeros(n),
+        }}
+        for level in ('sub_domain', 'domain'):
+            groups = len(self.keys[level])
+            order, starts = _groups(codes[level])
+            sizes = np.bincount(codes[level], minlength=groups)
+            self.agent_counts[level] = sizes
+            for time, _ in TIME_LEVELS:
+                if not n:
+                    empty = np.zeros((0, len(self.x[time])))
+                    self.counts[level][time] = empty.astype(np.int64)
+                    self.progress_mean[level][time] = self.progress_min[level][time] = self.progress_max[level][time] = empty
+                    continue
+                self.counts[level][time] = np.add.reduceat(self.counts['agent'][time][order], starts, axis=0)
+                grouped = self.progress_mean['agent'][time][order]
+                self.progress_mean[level][time] = np.add.reduceat(grouped, starts, axis=0) / sizes[:, None]
+                self.progress_min[level][time] = np.minimum.reduceat(grouped, starts, axis=0)
+                self.progress_max[level][time] = np.maximum.reduceat(grouped, starts, axis=0)
+            self.integration[level] = self._integration_stats(integration_years, codes[level], starts, sizes)
+
+    @staticmethod
+    def _integration_stats(years, codes, starts, sizes):
+        if not len(years):
+            empty = np.zeros(0)
+            return {'mean': empty, 'median': empty, 'min': empty, 'max': empty, 'std': empty}
+        ordered = years[np.lexsort((years, codes))]  # Sorted by group, then year
+        mean = np.add.reduceat(ordered, starts) / sizes
+        return {
+            'mean': mean,
+            'median': (ordered[starts + (sizes - 1) // 2] + ordered[starts + sizes // 2]) / 2,
+            'min': ordered[starts],
+            'max': ordered[starts + sizes - 1],
+            'std': np.sqrt(np.maximum(np.add.reduceat(ordered ** 2, starts) / sizes - mean ** 2, 0)),
+        }
+
+    @staticmethod
+    def level_of(key):
+        return HIERARCHY[len(key) - 1]
+
+    @staticmethod
+    def roll_up(key):
+        return key[:-1] or None
+
+    def drill_down(self, key):
+        level = HIERARCHY[len(key)]
+        return [self.keys[level][row] for row in self.rows(level, key)]
+
+    def rows(self, level, within=None):
+        # Rows of `level` under `within`, a key of a coarser level (None for all)
+        try:
+            return self._members[level][within]
+        except KeyError:
+            raise ValueError(f"Unknown {self.level_of(within)}: {' / '.join(within)}") from None
+
+    def fit_level(self, level, within=None, max_rows=None):
+        # The given level, rolled up while it has more than max_rows rows, but
+        # always finer than `within`
+        depth = max(HIERARCHY.index(level), len(within or ()))
+        while max_rows is not None and depth > len(within or ()) and \
+                len(self.rows(HIERARCHY[depth], within)) > max_rows:
+            depth -= 1
+        return HIERARCHY[depth]
+
+    def milestone_counts(self, level='agent', within=None, time='year'):
+        rows = self.rows(level, within)
+        return [self.labels[level][row] for row in rows], self.x[time], self.counts[level][time][rows]
+
+    def progress(self, level='agent', within=None, time='quarter', at_start=False):
+        # Bin means by default; at_start gives the values at the start of each
+        # bin instead, for curves drawn through those points
+        rows = self.rows(level, within)
+        source, step = (time, 1) if not at_start else ('month', dict(TIME_LEVELS)[time])
+        return {
+            'labels': [self.labels[level][row] for row in rows],
+            'keys': [self.keys[level][row] for row in rows],
+            'agents': self.agent_counts[level][rows],
+            'x': self.x[time],
+            'values': self.progress_mean[level][source][rows, ::step],
+            'lower': self.progress_min[level][source][rows, ::step],
+            'upper': self.progress_max[level][source][rows, ::step],
+        }
+
+    def integration_stats(self, level='agent', within=None):
+        rows = self.rows(level, within)
+        stats = self.integration[level]
+        return [
+            {
+                'Key': self.keys[level][row],
+                'Label': self.labels[level][row],
+                'Agents': int(self.agent_counts[level][row]),
+                **{name.capitalize(): float(values[row]) for name, values in stats.items()},
+            }
+            for row in rows
+        ]
+
+    def relationships(self, level='agent', within=None, window=RELATIONSHIP_WINDOW):
+        # Number of milestone pairs within `window` years of each other. With
+        # milestones already binned by year this is a banded matrix product.
+        labels, _, histogram = self.milestone_counts(level, within, 'year')
+        offsets = np.arange(histogram.shape[1])
+        band = (np.abs(offsets[:, None] - offsets[None, :]) <= window).astype(float)
+        matrix = histogram @ band @ histogram.T
+        np.fill_diagonal(matrix, 0)
+        return labels, matrix
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+# Configuration comes from the environment so it can be set per deployment:
+#   SESSION_MEMORY_TRACKING=1      measure object sizes with tracemalloc
+#   SESSION_MEMORY_CAP_MB=50       per-session cap; least recently used objects are evicted
+#   SESSION_MEMORY_SHARE=0         keep a private copy of every object in each session
+TRACKING = os.environ.get('SESSION_MEMORY_TRACKING', '0') == '1'
+SESSION_CAP_MB = float(os.environ['SESSION_MEMORY_CAP_MB']) if os.environ.get('SESSION_MEMORY_CAP_MB') else None
+SHARE_OBJECTS = os.environ.get('SESSION_MEMORY_SHARE', '1') == '1'
+SESSION_TTL_SECONDS = 30 * 60
+COMPONENTS = ('agents', 'dataframes', 'figures', 'report')
+
+_lock = threading.Lock()
+_shared = {}
+_sessions = {}
+_samples = deque(maxlen=500)
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def measure(builder):
+    # Allocations still alive after the builder returns are what the object
+    # retains. Other threads allocating at the same time are counted too, so
+    # sizes are estimates on a busy server.
+    if not (TRACKING or SESSION_CAP_MB):
+        return builder(), None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = builder()
+    return obj, max(0, tracemalloc.get_traced_memory()[0] - before)
+
+
+class SharedObject:
+    def __init__(self, component):
+        self.component = component
+        self.lock = threading.Lock()
+        self.ready = False
+        self.value = None
+        self.size = None
+
+
+class SessionObjectCache:
+    def __init__(self, cap_bytes=None):
+        self.cap_bytes = cap_bytes
+        self._entries = OrderedDict()  # name -> (component, value, size)
+        self.evictions = 0
+
+    def get(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        self._entries.move_to_end(name)
+        return entry
+
+    def put(self, name, component, value, size):
+        self._entries[name] = (component, value, size)
+        self._entries.move_to_end(name)
+        if self.cap_bytes is not None:
+            # The object just built always stays, even if it alone exceeds the cap
+            while self.total_bytes() > self.cap_bytes and len(self._entries) > 1:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, prefix):
+        for name in [n for n in self._entries if n.startswith(prefix)]:
+            del self._entries[name]
+
+    def total_bytes(self):
+        return sum(size or 0 for _, _, size in self._entries.values())
+
+    def by_component(self):
+        totals = dict.fromkeys(COMPONENTS, 0)
+        for component, _, size in self._entries.values():
+            totals[component] = totals.get(component, 0) + (size or 0)
+        return totals
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else 'local'
+
+
+def _session_cache():
+    import streamlit as st
+    if '_object_cache' not in st.session_state:
+        cap = SESSION_CAP_MB * 2 ** 20 if SESSION_CAP_MB else None
+        st.session_state['_object_cache'] = SessionObjectCache(cap)
+    return st.session_state['_object_cache']
+
+
+def _get_shared(name, component, builder):
+    with _lock:
+        shared = _shared.get(name)
+        if shared is None:
+            shared = _shared[name] = SharedObject(component)
+    if not shared.ready:
+        with shared.lock:
+            if not shared.ready:
+                shared.value, shared.size = measure(builder)
+                shared.ready = True
+    return shared.value
+
+
+def session_object(name, component, builder):
+    # Objects do not depend on the viewer, so they are built once per process
+    # when sharing is enabled; otherwise each session caches its own copy.
+    if SHARE_OBJECTS:
+        return _get_shared(name, component, builder)
+    cache = _session_cache()
+    entry = cache.get(name)
+    if entry is not None:
+        return entry[1]
+    value, size = measure(builder)
+    cache.put(name, component, value, size)
+    return value
+
+
+def record_session():
+    # Called once per run to refresh this session's line in the server ledger
+    cache = _session_cache()
+    now = time.time()
+    with _lock:
+        _sessions[_session_id()] = {
+            'components': cache.by_component(),
+            'total': cache.total_bytes(),
+            'evictions': cache.evictions,
+            'last_seen': now,
+        }
+        for session_id in [s for s, info in _sessions.items() if now - info['last_seen'] > SESSION_TTL_SECONDS]:
+            del _sessions[session_id]
+        _samples.append((now, len(_sessions), rss_bytes()))
+
+
+def touch_session():
+    # Keeps a session that stays inside one run (live mode) in the ledger
+    # without adding a memory sample for every tick
+    with _lock:
+        info = _sessions.get(_session_id())
+        if info is not None:
+            info['last_seen'] = time.time()
+
+
+def invalidate_shared(prefix=''):
+    with _lock:
+        for name in [n for n in _shared if n.startswith(prefix)]:
+            del _shared[name]
+
+
+def discard_session_objects(prefix=''):
+    # Private copies in the current session; shared ones go through invalidate_shared
+    _session_cache().discard(prefix)
+
+
+def memory_report():
+    with _lock:
+        sessions = {session_id: dict(info) for session_id, info in _sessions.items()}
+        shared = {name: (obj.component, obj.size) for name, obj in _shared.items() if obj.ready}
+        samples = list(_samples)
+    shared_by_component = dict.fromkeys(COMPONENTS, 0)
+    for component, size in shared.values():
+        shared_by_component[component] = shared_by_component.get(component, 0) + (size or 0)
+    return {
+        'tracking': TRACKING or bool(SESSION_CAP_MB),
+        'share_objects': SHARE_OBJECTS,
+        'session_cap_mb': SESSION_CAP_MB,
+        'rss_bytes': rss_bytes(),
+        'session_count': len(sessions),
+        'sessions': sessions,
+        'shared': shared_by_component,
+        'samples': samples,
+    }
@@ -0,0 +1,324 @@
+import argparse
+import html
+import json
+import logging
+import os
+import re
+import textwrap
+
+import plotly
+from plotly.offline import get_plotlyjs
+from streamlit.runtime.state import session_state_proxy
+
+# app.py is imported outside `streamlit run`; Streamlit sets each logger's level
+# when it creates it, so this must follow that import and precede app's
+logging.getLogger(session_state_proxy.__name__).setLevel(logging.ERROR)
+
+import app
+from ai_agents import get_all_agents, get_blueprint_phases
+from forecast_snapshots import agent_to_record, content_hash, encode
+from milestone_alignment import align_agents_to_blueprint, schedule_deltas
+from milestone_graph import build_milestone_graph
+from rollup_cube import RollupCube
+from timeline_lod import ProgressPyramid
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'site')
+MANIFEST_NAME = '.build-manifest.json'
+REPORT_NAME = 'ai_integration_approaches_comparison.md'
+PLOTLY_JS = f'assets/plotly-{plotly.__version__}.min.js'
+
+# Modules whose code shapes the rendered pages; editing one rebuilds everything
+SOURCE_FILES = [
+    'adoption_models.py', 'app.py', 'ai_agents.py', 'milestone_alignment.py', 'milestone_graph.py',
+    'prediction_parser.py', 'rollup_cube.py', 'static_site.py', 'timeline_data.py', 'timeline_lod.py',
+]
+
+PAGES = [
+    ('index.html', "AI Agents' Timeline"),
+    ('blueprint.html', "OpenAI-US Gov Blueprint"),
+    ('comparison.html', "Approach Comparison"),
+]
+
+STYLE = """
+body { background: #0e1117; color: #fafafa; font-family: "Source Sans Pro", sans-serif; margin: 0; }
+main { max-width: 1200px; margin: 0 auto; padding: 1rem 2rem 3rem; }
+nav { border-bottom: 1px solid #333; margin-bottom: 1.5rem; }
+nav a { color: #fafafa; display: inline-block; padding: 0.75rem 1rem; text-decoration: none; }
+nav a.active { border-bottom: 2px solid #ff4b4b; color: #ff4b4b; }
+a { color: #ff4b4b; }
+.columns { display: flex; gap: 1.5rem; }
+.columns > div { flex: 1; min-width: 0; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+th, td { border: 1px solid #333; padding: 0.3rem 0.5rem; text-align: left; }
+details { margin: 1rem 0; }
+hr { border: 0; border-top: 1px solid #333; }
+"""
+
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_ITEM = re.compile(r'^(\s*)(?:[-*]|\d+\.)\s+(.*)$')
+
+
+def _inline(text):
+    return _BOLD.sub(r'<strong>\1</strong>', html.escape(text, quote=False))
+
+
+def markdown_to_html(text):
+    # Covers the subset of Markdown the dashboard text and report use:
+    # headings, paragraphs, nested lists, bold, rules and pipe tables.
+    out = []
+    paragraph = []
+    lists = []  # stack of (indent, tag)
+    table = []
+
+    def flush_paragraph():
+        if paragraph:
+            out.append('<p>' + ' '.join(_inline(line) for line in paragraph) + '</p>')
+            paragraph.clear()
+
+    def close_lists(indent=-1):
+        while lists and lists[-1][0] > indent:
+            out.append(f'</li></{lists.pop()[1]}>')
+
+    def flush_table():
+        if table:
+            rows = [[cell.strip() for cell in row.strip().strip('|').split('|')] for row in table
+                    if not set(row.replace('|', '').strip()) <= set('-: ')]
+            out.append('<table><tr>' + ''.join(f'<th>{_inline(c)}</th>' for c in rows[0]) + '</tr>' +
+                       ''.join('<tr>' + ''.join(f'<td>{_inline(c)}</td>' for c in row) + '</tr>'
+                               for row in rows[1:]) + '</table>')
+            table.clear()
+
+    for line in textwrap.dedent(text).split('\n'):
+        stripped = line.strip()
+        item = _ITEM.match(line)
+        if stripped.startswith('|'):
+            flush_paragraph()
+            close_lists()
+            table.append(stripped)
+            continue
+        flush_table()
+        if not stripped:
+            flush_paragraph()
+            continue
+        if stripped.startswith('#'):
+            flush_paragraph()
+            close_lists()
+            level = len(stripped) - len(stripped.lstrip('#'))
+            out.append(f'<h{level}>{_inline(stripped[level:].strip())}</h{level}>')
+        elif stripped == '---':
+            flush_paragraph()
+            close_lists()
+            out.append('<hr>')
+        elif item:
+            flush_paragraph()
+            indent = len(item.group(1))
+            tag = 'ol' if stripped[0].isdigit() else 'ul'
+            if lists and lists[-1][0] == indent:
+                out.append('</li>')
+            elif not lists or lists[-1][0] < indent:
+                out.append(f'<{tag}>')
+                lists.append((indent, tag))
+            else:
+                close_lists(indent)
+                out.append('</li>')
+            out.append('<li>' + _inline(item.group(2)))
+        elif lists:
+            out[-1] += ' ' + _inline(stripped)  # continuation of a list item
+        else:
+            paragraph.append(stripped)
+    flush_paragraph()
+    flush_table()
+    close_lists()
+    return '\n'.join(out)
+
+
+def figure_html(fig, div_id):
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=div_id,
+                       config={'responsive': True})
+
+
+def table_html(df):
+    return df.to_html(index=False, border=0, float_format=lambda value: f'{value:.2f}')
+
+
+def agent_details_html(agents):
+    parts = []
+    for agent in agents:
+        milestones = ''.join(f'<li><strong>{year}:</strong> {html.escape(milestone)}</li>'
+                             for year, milestone in agent.yearly_milestones.items())
+        predictions = ''.join(f'<li>{html.escape(prediction)}</li>' for prediction in agent.predictions)
+        parts.append(
+            f'<h3>{html.escape(agent.name)} - Integration Year: {agent.integration_year}</h3>'
+            f'<p><strong>Domain:</strong> {html.escape(agent.domain)}</p>'
+            f'<p><strong>Description:</strong> {html.escape(agent.description)}</p>'
+            f'<p><strong>Yearly Milestones:</strong></p><ul>{milestones}</ul>'
+            + (f'<p><strong>Key Predictions:</strong></p><ol>{predictions}</ol>' if predictions else '')
+            + '<hr>'
+        )
+    return '\n'.join(parts)
+
+
+def render_agents_page(agents):
+    cube = RollupCube(agents)
+    explorer = ProgressPyramid(cube).query()
+    x_range = (explorer['x'][0], explorer['x'][-1]) if explorer['x'] else (2025, 2036)
+    return '\n'.join([
+        "<h2>AI Agents' Integration Timeline</h2>",
+        markdown_to_html(app.TIMELINE_MARKDOWN),
+        figure_html(app.create_timeline(cube), 'timeline'),
+        '<div class="columns"><div>',
+        figure_html(app.create_integration_progress_chart(cube), 'progress'),
+        figure_html(app.create_milestone_heatmap(cube), 'heatmap'),
+        '</div><div>',
+        figure_html(app.create_domain_relationships(cube), 'relationships'),
+        markdown_to_html(app.VISUALIZATIONS_MARKDOWN),
+        '</div></div>',
+        '<h2>Explore Integration Progress</h2>',
+        '<p>Use the chart toolbar to zoom into a year range.</p>',
+        figure_html(app.create_progress_detail_chart(explorer, x_range), 'progress-detail'),
+        figure_html(app.create_prediction_events_chart(agents), 'events'),
+        '<h2>Detailed Agent Predictions</h2>',
+        markdown_to_html(app.AGENT_DETAILS_MARKDOWN),
+        agent_details_html(agents),
+    ])
+
+
+def render_blueprint_page(phases):
+    return '\n'.join([
+        '<h2>OpenAI-US Government Blueprint Timeline</h2>',
+        markdown_to_html(app.BLUEPRINT_MARKDOWN),
+        figure_html(app.create_blueprint_timeline(phases), 'blueprint'),
+        '<details><summary>View Detailed Timeline</summary>',
+        markdown_to_html(app.BLUEPRINT_DETAILS_MARKDOWN),
+        '</details>',
+    ])
+
+
+def render_comparison_page(agents, phases, alignment, domain_deltas):
+    milestone_graph = build_milestone_graph(agents, phases)
+    return '\n'.join([
+        '<h2>Approach Comparison Analysis</h2>',
+        markdown_to_html(app.COMPARISON_MARKDOWN),
+        '<h3>Schedule Alignment</h3>',
+        markdown_to_html(app.ALIGNMENT_MARKDOWN),
+        figure_html(app.create_schedule_delta_chart(domain_deltas), 'alignment'),
+        '<details><summary>View Milestone Matches</summary>',
+        table_html(alignment.drop(columns=['Rank'])),
+        '</details>',
+        '<details><summary>View Milestone Dependencies and Critical Path</summary>',
+        f'<p><strong>Projected completion:</strong> {milestone_graph.project_end:.2f}</p>',
+        '<p><strong>Critical path:</strong> ' + html.escape(' → '.join(milestone_graph.critical_path())) + '</p>',
+        table_html(app.pd.DataFrame(milestone_graph.to_records())),
+        '</details>',
+        f'<p><a href="{REPORT_NAME}" download>📥 Download Full Comparison Report</a></p>',
+    ])
+
+
+def page_shell(filename, body):
+    nav = ''.join(
+        f'<a href="{name}" class="active">{html.escape(title)}</a>' if name == filename
+        else f'<a href="{name}">{html.escape(title)}</a>'
+        for name, title in PAGES
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        '<title>AI Integration Analysis</title>\n'
+        f'<style>{STYLE}</style>\n<script src="{PLOTLY_JS}"></script>\n</head>\n<body>\n<main>\n'
+        '<h1>AI Integration in America Analysis Dashboard</h1>\n'
+        f'{markdown_to_html(app.ABOUT_MARKDOWN)}\n<nav>{nav}</nav>\n{body}\n</main>\n</body>\n</html>\n'
+    )
+
+
+def source_digest():
+    digest = [plotly.__version__]
+    for name in SOURCE_FILES:
+        with open(os.path.join(BASE_DIR, name), 'rb') as f:
+            digest.append(content_hash(f.read()))
+    return content_hash(encode(digest))
+
+
+class SiteBuilder:
+    # Each output's inputs (data it is rendered from plus the rendering code)
+    # are hashed before rendering; outputs whose input hash matches the last
+    # build and whose file is still on disk are skipped without rendering.
+    def __init__(self, output_dir=DEFAULT_OUTPUT, force=False):
+        self.output_dir = output_dir
+        self.force = force
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = {}
+        if not force and os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.built = []
+        self.skipped = []
+
+    def output(self, name, inputs, render):
+        key = content_hash(encode(inputs))
+        path = os.path.join(self.output_dir, name)
+        if self.manifest.get(name, {}).get('inputs') == key and os.path.exists(path):
+            self.skipped.append(name)
+            return
+        data = render()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.manifest[name] = {'inputs': key, 'output': content_hash(data)}
+        self.built.append(name)
+
+    def save_manifest(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+
+def build_site(output_dir=DEFAULT_OUTPUT, force=False, agents=None, phases=None):
+    agents = agents if agents is not None else get_all_agents()
+    phases = phases if phases is not None else get_blueprint_phases()
+    code = source_digest()
+    agents_key = [agent_to_record(agent) for agent in agents]
+    phases_key = [[phase, [list(m) for m in milestones]] for phase, milestones in phases.items()]
+
+    builder = SiteBuilder(output_dir, force)
+    builder.output(PLOTLY_JS, [plotly.__version__], get_plotlyjs)
+
+    analysis = {}
+
+    def comparison_inputs():
+        # Alignment feeds both the comparison page and the report; compute it once
+        if not analysis:
+            analysis['alignment'] = align_agents_to_blueprint(agents, phases)
+            analysis['deltas'] = schedule_deltas(analysis['alignment'])
+        return analysis['alignment'], analysis['deltas']
+
+    builder.output('index.html', [code, agents_key],
+                   lambda: page_shell('index.html', render_agents_page(agents)))
+    builder.output('blueprint.html', [code, phases_key],
+                   lambda: page_shell('blueprint.html', render_blueprint_page(phases)))
+    builder.output('comparison.html', [code, agents_key, phases_key],
+                   lambda: page_shell('comparison.html', render_comparison_page(agents, phases, *comparison_inputs())))
+    builder.output(REPORT_NAME, [code, agents_key, phases_key],
+                   lambda: app.generate_comparison_report(comparison_inputs()[1]))
+    builder.save_manifest()
+    return builder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prebuild the dashboard as static HTML for read-only hosting")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--force', action='store_true', help="rebuild every page even if unchanged")
+    args = parser.parse_args()
+
+    builder = build_site(args.output, args.force)
+    for name in builder.built:
+        print(f"built    {name}")
+    for name in builder.skipped:
+        print(f"skipped  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import http.client
+import threading
+import time
+
+import pytest
+
+from api_server import accepts_gzip, create_server
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, False),
+    ('', False),
+    ('gzip', True),
+    ('deflate, gzip;q=0.5', True),
+    ('gzip;q=0', False),
+    ('gzip; q=0.000', False),
+    ('*', True),
+    ('*;q=0', False),
+    ('*, gzip;q=0', False),
+    ('gzip;q=0, *', False),
+    ('*;q=0, gzip', True),
+    ('GZIP;Q=1', True),
+    ('identity', False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+@pytest.fixture
+def server():
+    server = create_server(port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(connection, path):
+    connection.request('GET', path)
+    response = connection.getresponse()
+    response.read()
+    return response.status
+
+
+def test_idle_keep_alive_connections_do_not_hold_workers(server):
+    port = server.server_address[1]
+    idle = [http.client.HTTPConnection('127.0.0.1', port, timeout=5) for _ in range(6)]
+    for connection in idle:
+        assert get(connection, '/api') == 200
+    sockets = [connection.sock for connection in idle]
+
+    # More idle connections than workers, yet a new client is served at once
+    start = time.perf_counter()
+    assert get(http.client.HTTPConnection('127.0.0.1', port, timeout=5), '/api/heatmap') == 200
+    assert time.perf_counter() - start < 2
+
+    # The parked connections are resumed, not reopened
+    for connection, sock in zip(idle, sockets):
+        assert get(connection, '/api/progress') == 200
+        assert connection.sock is sock
+        connection.close()
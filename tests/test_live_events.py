@@ -0,0 +1,43 @@
+import pytest
+
+from ai_agents import get_all_agents
+from live_events import LiveFeed
+
+
+def test_rejected_event_leaves_agent_unchanged():
+    feed = LiveFeed()
+    before = {agent.name: agent for agent in feed.snapshot().agents}['Vision and Purpose Agent']
+    snapshot = feed.apply([
+        {'type': 'agent', 'agent': 'Vision and Purpose Agent', 'domain': 'Hijacked', 'integration_year': 'bad'},
+        {'type': 'milestone', 'agent': 'Vision and Purpose Agent', 'year': 2031, 'text': 'New milestone'},
+    ])
+    agent = {agent.name: agent for agent in snapshot.agents}['Vision and Purpose Agent']
+    assert (snapshot.applied, snapshot.rejected) == (1, 1)
+    assert agent.domain == before.domain
+    assert agent.integration_year == before.integration_year
+    assert agent.yearly_milestones[2031] == 'New milestone'
+    assert 2031 not in before.yearly_milestones or before.yearly_milestones[2031] != 'New milestone'
+
+
+def test_rejected_new_agent_is_not_added():
+    feed = LiveFeed()
+    snapshot = feed.apply([
+        {'type': 'agent', 'agent': 'Half Built Agent', 'domain': 'Energy'},
+        {'type': 'agent', 'agent': 'Broken Agent', 'domain': 'Energy', 'integration_year': 'soon'},
+    ])
+    assert snapshot.rejected == 2
+    assert [agent.name for agent in snapshot.agents] == [agent.name for agent in get_all_agents()]
+
+
+@pytest.mark.parametrize('event', [
+    {'type': 'integration_year', 'agent': 'Vision and Purpose Agent', 'year': 2025},
+    {'type': 'agent', 'agent': 'Vision and Purpose Agent', 'integration_year': 2024},
+    {'type': 'agent', 'agent': 'Early Agent', 'domain': 'Energy', 'integration_year': 2025},
+])
+def test_integration_year_must_follow_start_year(event):
+    feed = LiveFeed()
+    before = feed.snapshot().agents
+    snapshot = feed.apply([event])
+    assert snapshot.rejected == 1
+    assert [(agent.name, agent.integration_year) for agent in snapshot.agents] == \
+        [(agent.name, agent.integration_year) for agent in before]
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+from ai_agents import AIAgent
+from milestone_alignment import (TEXT_WEIGHT, TIME_SCALE, align_agents_to_blueprint, align_milestones,
+                                 schedule_deltas, tfidf_matrices)
+
+WORDS = ['ai', 'adoption', 'federal', 'agencies', 'compute', 'grid', 'energy', 'chips', 'workforce',
+         'training', 'safety', 'standards', 'research', 'health', 'records', 'defense', 'export',
+         'controls', 'data', 'centers', 'education', 'states', 'pilot', 'national', 'the', 'and', 'full']
+
+
+def random_texts(rng, n):
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))) for _ in range(n)]
+
+
+def random_years(rng, n):
+    # Whole years produce many exact ties in time proximity
+    if rng.random() < 0.5:
+        return [rng.randint(2025, 2035) for _ in range(n)]
+    return [round(rng.uniform(2025, 2035), 2) for _ in range(n)]
+
+
+def dense_scores(left_texts, left_years, right_texts, right_years):
+    left, right = tfidf_matrices(left_texts, right_texts)
+    similarity = (left @ right.T).toarray()
+    distance = np.abs(np.asarray(left_years, dtype=float)[:, None] - np.asarray(right_years, dtype=float)[None, :])
+    return TEXT_WEIGHT * similarity + (1 - TEXT_WEIGHT) * np.exp(-distance / TIME_SCALE), similarity
+
+
+@pytest.mark.parametrize('seed', range(25))
+def test_sparse_top_k_matches_dense_brute_force(seed):
+    rng = random.Random(seed)
+    n_left, n_right = rng.randint(1, 80), rng.randint(1, 40)
+    k = rng.choice([1, 3, 5, 10])
+    left_texts, right_texts = random_texts(rng, n_left), random_texts(rng, n_right)
+    left_years, right_years = random_years(rng, n_left), random_years(rng, n_right)
+
+    indices, scores, similarities = align_milestones(left_texts, left_years, right_texts, right_years,
+                                                     k=k, chunk_size=rng.choice([7, 2048]))
+    expected, expected_similarity = dense_scores(left_texts, left_years, right_texts, right_years)
+    k = min(k, n_right)
+    assert indices.shape == (n_left, k)
+
+    rows = np.arange(n_left)[:, None]
+    # Ties may be broken either way, so compare score values rather than indices
+    assert scores == pytest.approx(-np.sort(-expected, axis=1)[:, :k], abs=1e-5)
+    assert scores == pytest.approx(expected[rows, indices], abs=1e-5)
+    assert similarities == pytest.approx(expected_similarity[rows, indices], abs=1e-5)
+    assert all(len(set(row)) == k for row in indices.tolist())
+    assert np.all(np.diff(scores, axis=1) <= 1e-6)
+
+
+def test_no_shared_terms_falls_back_to_nearest_years():
+    indices, scores, similarities = align_milestones(['grid energy'], [2030], ['chips', 'safety', 'export'],
+                                                     [2025, 2031, 2034], k=2)
+    assert indices.tolist() == [[1, 2]]
+    assert similarities.tolist() == [[0, 0]]
+
+
+def test_agents_without_milestones_align_to_empty_frame():
+    matches = align_agents_to_blueprint([AIAgent('Quiet Agent', 'Research', '')], k=3)
+    assert matches.empty
+    assert {'Agent', 'Year', 'Rank', 'Blueprint Milestone', 'Score', 'Delta Years'} <= set(matches.columns)
+    assert schedule_deltas(matches).empty
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from milestone_graph import MilestoneGraph
+
+
+def random_graph(rng, n, edge_probability):
+    nodes = [(f"m{i}", rng.uniform(2025, 2035), rng.choice([0.0, 0.25, 1.0])) for i in range(n)]
+    # Edges only point to later indices, so the graph is acyclic
+    edges = [(f"m{i}", f"m{j}", rng.choice([0.0, 0.0, 0.5]))
+             for i in range(n) for j in range(i + 1, n) if rng.random() < edge_probability]
+    return nodes, edges
+
+
+def build(nodes, edges):
+    graph = MilestoneGraph()
+    for node_id, year, duration in nodes:
+        graph.add_milestone(node_id, year, duration)
+    for before, after, lag in edges:
+        graph.add_dependency(before, after, lag)
+    return graph.schedule()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_move_milestone_matches_full_reschedule(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_graph(rng, rng.randint(2, 60), rng.choice([0.02, 0.1, 0.3]))
+    graph = build(nodes, edges)
+    for _ in range(30):
+        node_id = rng.choice(nodes)[0]
+        graph.move_milestone(node_id, rng.uniform(2024, 2037))
+        expected = build([(v, graph.release[i], d) for i, (v, _, d) in enumerate(nodes)], edges)
+        assert graph.earliest_start == pytest.approx(expected.earliest_start)
+        assert graph.project_end == pytest.approx(expected.project_end)
+        assert graph.to_records() == pytest.approx(expected.to_records())
+
+
+def test_move_milestone_returns_changed_milestones():
+    graph = build([('a', 2025, 1.0), ('b', 2026, 1.0), ('c', 2030, 0.0)], [('a', 'b', 0.0)])
+    assert graph.move_milestone('a', 2027) == ['a', 'b']
+    assert graph.earliest_start == [2027, 2028, 2030]
+    assert graph.project_end == 2030
+    assert graph.move_milestone('c', 2025) == ['c']
+    assert graph.project_end == 2029
@@ -0,0 +1,61 @@
+import pytest
+
+from ai_agents import get_all_agents
+from prediction_parser import clear_cache, extract_targets, parse_prediction
+
+CASES = [
+    # Predictions from ai_agents.py
+    ("AI-powered personalized medicine becomes standard by 2028", 2028, "AI-powered personalized medicine", None),
+    ("Automated scientific discovery platforms emerge by 2030", 2030, "Automated scientific discovery platforms", None),
+    ("AI tutors achieve human-level effectiveness by 2029", 2029, "AI tutors", None),
+    ("Healthcare diagnosis accuracy surpasses human doctors by 2027", 2027, "Healthcare diagnosis accuracy", None),
+    ("AI research assistants become ubiquitous in academia by 2026", 2026, "AI research assistants", None),
+    ("Breakthrough in protein folding leads to new drug discoveries by 2028", 2028,
+     "Breakthrough in protein folding", None),
+    ("AI-driven public services reach 90% efficiency by 2031", 2031, "AI-driven public services", 90.0),
+    ("AI creates more jobs than it displaces by 2029", 2029, "AI", None),
+    ("50% of US manufacturing uses AI automation by 2030", 2030, "US manufacturing", 50.0),
+    ("AI-driven startups comprise 30% of new businesses by 2028", 2028, "AI-driven startups", 30.0),
+    ("Universal Basic Income pilots launch in response to AI transition by 2027", 2027,
+     "Universal Basic Income pilots", None),
+    ("AI-powered economic planning tools adopted by 40 states by 2029", 2029, "AI-powered economic planning tools", None),
+    ("Digital transformation of traditional industries complete by 2032", 2032,
+     "Digital transformation of traditional industries", None),
+    ("AI contributes to 25% of GDP growth by 2031", 2031, "AI", 25.0),
+    ("AI-powered cyber defense systems fully operational by 2028", 2028, "AI-powered cyber defense systems", None),
+    ("Autonomous defense systems integration complete by 2030", 2030, "Autonomous defense systems integration", None),
+    ("AI threat detection accuracy reaches 99.9% by 2029", 2029, "AI threat detection accuracy", 99.9),
+    ("International AI security alliance formed by 2027", 2027, "International AI security alliance", None),
+    ("Quantum-resistant AI encryption standard established by 2031", 2031,
+     "Quantum-resistant AI encryption standard", None),
+    ("AI-driven diplomatic analysis systems deployed by 2028", 2028, "AI-driven diplomatic analysis systems", None),
+    ("Complete integration of AI in military logistics by 2032", 2032,
+     "Complete integration of AI in military logistics", None),
+    # Leading and mid-sentence clauses, in either case
+    ("By 2030, 40% of jobs use AI", 2030, "jobs", 40.0),
+    ("BY 2030 40% of jobs use AI", 2030, "jobs", 40.0),
+    ("In 2027, federal agencies adopt AI assistants", 2027, "federal agencies adopt AI assistants", None),
+    ("in 2029 AI tutors reach 80% of students", 2029, "AI tutors", 80.0),
+    ("AI adoption by 2030 reaches 50%", 2030, "AI adoption", 50.0),
+    ("Before 2033: national AI grid operational", 2033, "national AI grid", None),
+    # Years that are not part of a clause
+    ("AI standards from 2024 updated in 2026", 2026, "AI standards from 2024 updated", None),
+    ("Model 12025 released", None, "Model 12025 released", None),
+]
+
+
+@pytest.mark.parametrize('text, year, metric, percent', CASES)
+def test_parse_prediction(text, year, metric, percent):
+    target = parse_prediction(text)
+    assert (target.text, target.year, target.metric, target.percent) == (text, year, metric, percent)
+
+
+def test_table_covers_every_agent_prediction():
+    table = {case[0] for case in CASES}
+    assert {text for agent in get_all_agents() for text in agent.predictions} <= table
+
+
+def test_extract_targets_matches_parse_prediction():
+    texts = [case[0] for case in CASES] * 2
+    clear_cache()
+    assert extract_targets(texts) == [parse_prediction(text) for text in texts]
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_agents import AIAgent
+from rollup_cube import HIERARCHY, RollupCube
+from timeline_data import END_YEAR, START_YEAR, TIME_LEVELS, integration_progress
+
+
+def random_agents(rng, n):
+    agents = []
+    for i in range(n):
+        agent = AIAgent(f'Agent {i}', f'Domain {rng.randint(0, 3)}', '')
+        # A missing sub-domain defaults to the domain
+        agent.set_sub_domain(rng.choice([None, 'Sub-domain 0', 'Sub-domain 1', 'Sub-domain 2']))
+        agent.set_integration_year(rng.randint(START_YEAR + 1, END_YEAR + 5))
+        agent.set_yearly_milestones({year: 'Milestone' for year in rng.sample(range(START_YEAR - 2, END_YEAR + 3),
+                                                                              rng.randint(0, 6))})
+        agents.append(agent)
+    return agents
+
+
+def monthly_frame(agents):
+    # One row per agent and month, the way a straightforward report would hold it
+    months = (END_YEAR - START_YEAR + 1) * 12
+    progress = integration_progress(agents, START_YEAR + np.arange(months) / 12)
+    rows = []
+    for i, agent in enumerate(agents):
+        for month in range(months):
+            year, first_month = divmod(month, 12)
+            rows.append({
+                'domain': agent.domain, 'sub_domain': agent.sub_domain or agent.domain, 'agent': agent.name,
+                'month': month, 'progress': progress[i, month],
+                'milestones': int(first_month == 0 and START_YEAR + year in agent.yearly_milestones),
+                'integration_year': agent.integration_year,
+            })
+    return pd.DataFrame(rows)
+
+
+def expected_by_key(frame, level, months_per_bin):
+    group = list(HIERARCHY[:HIERARCHY.index(level) + 1])
+    binned = frame.assign(bin=frame['month'] // months_per_bin)
+    # Progress is averaged over the months of a bin first, then across agents
+    per_agent = binned.groupby(['domain', 'sub_domain', 'agent', 'bin'], as_index=False).agg(
+        progress=('progress', 'mean'), milestones=('milestones', 'sum'))
+    cells = per_agent.groupby(group + ['bin']).agg(
+        counts=('milestones', 'sum'), mean=('progress', 'mean'),
+        lower=('progress', 'min'), upper=('progress', 'max'))
+    years = frame.drop_duplicates('agent').groupby(group)['integration_year']
+    stats = pd.DataFrame({'Agents': years.size(), 'Mean': years.mean(), 'Median': years.median(),
+                          'Min': years.min(), 'Max': years.max(), 'Std': years.std(ddof=0)})
+    expected = {}
+    for key in stats.index:
+        key_tuple = key if isinstance(key, tuple) else (key,)
+        expected[key_tuple] = {'cells': cells.loc[key_tuple], 'stats': stats.loc[key]}
+    return expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_cube_matches_groupby(seed):
+    rng = random.Random(seed)
+    agents = random_agents(rng, rng.randint(1, 40))
+    cube = RollupCube(agents)
+    frame = monthly_frame(agents)
+
+    for level in HIERARCHY:
+        scopes = [None] + [key for coarser in HIERARCHY[:HIERARCHY.index(level)] for key in cube.keys[coarser]]
+        for time, months_per_bin in TIME_LEVELS:
+            expected = expected_by_key(frame, level, months_per_bin)
+            for within in scopes:
+                keys = [key for key in expected if within is None or key[:len(within)] == within]
+                labels, x, counts = cube.milestone_counts(level, within, time)
+                progress = cube.progress(level, within, time)
+                stats = cube.integration_stats(level, within)
+                assert sorted(progress['keys']) == sorted(keys)
+                assert len(labels) == len(keys) and len(x) == len(progress['x']) == counts.shape[1]
+
+                for i, key in enumerate(progress['keys']):
+                    cells = expected[key]['cells']
+                    assert counts[i].tolist() == cells['counts'].tolist()
+                    assert progress['values'][i] == pytest.approx(cells['mean'].to_numpy())
+                    assert progress['lower'][i] == pytest.approx(cells['lower'].to_numpy())
+                    assert progress['upper'][i] == pytest.approx(cells['upper'].to_numpy())
+                    assert progress['agents'][i] == expected[key]['stats']['Agents']
+
+                    row = stats[i]
+                    assert row['Key'] == key
+                    for name in ('Agents', 'Mean', 'Median', 'Min', 'Max', 'Std'):
+                        assert row[name] == pytest.approx(expected[key]['stats'][name])
+
+                # Values at the start of each bin are the month samples there
+                at_start = cube.progress(level, within, time, at_start=True)['values']
+                monthly = cube.progress(level, within, 'month')['values']
+                assert np.array_equal(at_start, monthly[:, ::months_per_bin])
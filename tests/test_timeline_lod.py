@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from ai_agents import AIAgent
+from rollup_cube import RollupCube
+from timeline_lod import ProgressPyramid
+
+
+@pytest.fixture(scope='module')
+def pyramid():
+    # 3 domains of 40 agents, each domain split over 7 sub-domains
+    rng = random.Random(0)
+    agents = []
+    for i in range(120):
+        agent = AIAgent(f'Agent {i}', f'Domain {i % 3}', '')
+        agent.set_sub_domain(f'Sub-domain {i % 7}')
+        agent.set_integration_year(rng.randint(2027, 2035))
+        agents.append(agent)
+    return ProgressPyramid(RollupCube(agents))
+
+
+@pytest.mark.parametrize('within, max_traces, entity, names', [
+    (None, 120, 'agent', 120),
+    (None, 25, 'sub_domain', 21),
+    (None, 10, 'domain', 3),
+    (('Domain 0',), 40, 'agent', 40),
+    (('Domain 0',), 25, 'sub_domain', 7),
+    (('Domain 0',), 5, 'domain', ['Domain 0']),
+    (('Domain 0', 'Sub-domain 0'), 25, 'agent', 6),
+    (('Domain 0', 'Sub-domain 0'), 5, 'sub_domain', ['Sub-domain 0']),
+])
+def test_query_within_a_group(pyramid, within, max_traces, entity, names):
+    view = pyramid.query(2027, 2029, within, max_traces=max_traces)
+    assert view['entity'] == entity and view['level'] == 'month'
+    assert len(view['series']) <= max_traces
+    if isinstance(names, int):
+        assert len(view['series']) == names
+    else:
+        assert [series['name'] for series in view['series']] == names
+    for series in view['series']:
+        assert len(series['values']) == len(view['x'])
+        if entity != 'agent':
+            assert all(lower <= value <= upper for lower, value, upper
+                       in zip(series['lower'], series['values'], series['upper']))
+
+
+@pytest.mark.parametrize('within', [('Unknown',), ('Domain 0', 'Unknown'), ('Domain 0', 'Sub-domain 0', 'Agent 0')])
+def test_query_rejects_unknown_groups(pyramid, within):
+    with pytest.raises(ValueError):
+        pyramid.query(within=within)
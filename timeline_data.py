@@ -0,0 +1,21 @@
+import numpy as np
+
+from adoption_models import adoption_curves
+
+START_YEAR = 2025
+END_YEAR = 2035
+PROGRESS_YEARS = np.arange(START_YEAR, END_YEAR + 1, 0.25)  # Quarterly progress
+TIME_LEVELS = [('month', 1), ('quarter', 3), ('year', 12)]  # Time bins, in months per bin
+
+
+def domain_label(agent):
+    return agent.name.split(' Agent')[0]
+
+
+def integration_progress(agents, years=PROGRESS_YEARS):
+    # Each agent's adoption curve from 2025 to its integration year, one row per agent
+    years = np.asarray(years, dtype=float)
+    end_years = np.array([agent.integration_year for agent in agents], dtype=float)[:, None]
+    progress = adoption_curves(agents, years, START_YEAR)
+    progress = np.where(years[None, :] > end_years, 100.0, progress)
+    return np.where(years[None, :] < START_YEAR, 0.0, progress)
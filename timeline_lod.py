@@ -0,0 +1,85 @@
+import numpy as np
+
+from timeline_data import START_YEAR, TIME_LEVELS as LEVELS
+
+MAX_POINTS = 120
+MAX_TRACES = 25
+MAX_BARS = 40
+
+
+class ProgressPyramid:
+    # Zoomable views over a RollupCube's month, quarter and year progress.
+    # Queries slice the finest level that keeps the window within max_points,
+    # so the size of a view depends on the window and not on the population.
+    def __init__(self, cube):
+        self.cube = cube
+        self.start = cube.start
+        self.x = cube.x
+
+    def choose_level(self, x0, x1, max_points=MAX_POINTS):
+        # Levels run from finest to coarsest; the first that fits wins
+        span_months = max(1, (x1 - x0) * 12)
+        for level, months_per_point in LEVELS:
+            if span_months / months_per_point <= max_points:
+                return level
+        return LEVELS[-1][0]
+
+    def query(self, x0=None, x1=None, within=None, max_points=MAX_POINTS, max_traces=MAX_TRACES, level=None):
+        # `within` is a cube key (a domain or sub-domain) as for RollupCube.rows
+        x0 = self.start if x0 is None else x0
+        x1 = self.x['year'][-1] + 1 if x1 is None else x1
+        level = level or self.choose_level(x0, x1, max_points)
+        x = self.x[level]
+        window = np.flatnonzero((x >= x0) & (x <= x1))
+
+        # Per-agent series when they fit, otherwise the finest groups below
+        # `within` that do, or `within` itself when even its agents do not
+        self.cube.rows('agent', within)  # ValueError for an unknown group
+        entity, parent, only = self.cube.fit_level('agent', within, max_traces), within, None
+        if within is not None and len(self.cube.rows(entity, within)) > max_traces:
+            entity, parent, only = self.cube.level_of(within), self.cube.roll_up(within), within
+        view = self.cube.progress(entity, parent, level)
+
+        series = []
+        for i, key in enumerate(view['keys']):
+            if only is not None and key != only:
+                continue
+            if entity == 'agent':
+                series.append({'name': view['labels'][i], 'domain': key[0],
+                               'values': view['values'][i, window].tolist()})
+            else:
+                series.append({
+                    'name': view['labels'][i],
+                    'agents': int(view['agents'][i]),
+                    'values': view['values'][i, window].tolist(),
+                    'lower': view['lower'][i, window].tolist(),
+                    'upper': view['upper'][i, window].tolist(),
+                })
+        return {'level': level, 'entity': entity, 'x': x[window].tolist(), 'series': series}
+
+def timeline_rows(cube, level='agent', within=None, max_bars=MAX_BARS):
+    # Per-agent bars when they fit, otherwise one summary bar per group
+    level = cube.fit_level(level, within, max_bars)
+    stats = cube.integration_stats(level, within)
+    if level == 'agent':
+        return [
+            {
+                'Agent': row['Key'][2].replace(' Agent', ''),
+                'Start Year': START_YEAR,
+                'Integration Year': row['Mean'],
+                'Domain': row['Key'][0],
+                'Description': cube.descriptions[cube.index['agent'][row['Key']]]
+            }
+            for row in stats
+        ]
+    return [
+        {
+            'Agent': f"{row['Label']} ({row['Agents']} agents)",
+            'Start Year': START_YEAR,
+            'Integration Year': row['Median'],
+            'Domain': row['Key'][0],
+            'Description': f"Median of {row['Agents']} agents; integration years "
+                           f"{row['Min']:g}-{row['Max']:g}"
+        }
+        for row in stats
+    ]